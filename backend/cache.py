@@ -5,7 +5,7 @@ Uses Redis DB 1 (separate from Celery which uses DB 0)
 """
 
 import redis
-import json
+import orjson
 import hashlib
 import os
 from functools import wraps
@@ -90,7 +90,7 @@ class RedisCache:
             if value:
                 self._stats["hits"] += 1
                 # Deserialize JSON
-                return json.loads(value)
+                return orjson.loads(value)
             else:
                 self._stats["misses"] += 1
                 return None
@@ -115,8 +115,12 @@ class RedisCache:
             return False
         
         try:
-            # Serialize to JSON
-            serialized = json.dumps(value, default=str)
+            # Serialize to JSON (orjson: native datetime/numpy, much faster than json)
+            serialized = orjson.dumps(
+                value,
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
             self.client.setex(key, ttl, serialized)
             self._stats["sets"] += 1
             return True
@@ -3,13 +3,19 @@ Feedback-based Retrieval Re-ranker
 Uses human feedback to improve RAG retrieval relevance over time
 """
 
+import copy
 import json
+import threading
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any
-from collections import defaultdict
+from typing import List, Dict, Any, Tuple
+from collections import defaultdict, OrderedDict
 from loguru import logger
 
+# Max re-ranked result lists kept per ranker (LRU)
+RERANK_CACHE_SIZE = 4096
+
 
 class FeedbackRanker:
     """
@@ -23,8 +29,15 @@ class FeedbackRanker:
     
     def __init__(self, feedback_path: str = "data/human_feedback.csv"):
         self.feedback_path = Path(feedback_path)
+        # Aggregated topic scores, reused until the feedback CSV changes
+        self.signals_cache_path = self.feedback_path.with_suffix('.signals.json')
+        self._ranking_stats = None
         self.topic_scores = {}  # topic -> approval rate
         self.context_patterns = {}  # successful context patterns
+        self._rerank_cache: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self._rerank_cache_lock = threading.Lock()
+        self._rerank_cache_hits = 0
+        self._rerank_cache_misses = 0
         self._load_feedback_signals()
     
     def _load_feedback_signals(self):
@@ -33,6 +46,15 @@ class FeedbackRanker:
             logger.warning(f"Feedback file not found: {self.feedback_path}")
             return
         
+        # Reuse the last aggregation if the feedback file is unchanged
+        file_stat = self.feedback_path.stat()
+        fingerprint = [file_stat.st_mtime_ns, file_stat.st_size]
+        cached = self._read_signals_cache(fingerprint)
+        if cached is not None:
+            self.topic_scores = cached
+            logger.info(f"Loaded cached feedback signals: {len(self.topic_scores)} topics")
+            return
+        
         try:
             df = pd.read_csv(self.feedback_path)
             
@@ -45,10 +67,31 @@ class FeedbackRanker:
                     self.topic_scores[topic] = approved / total if total > 0 else 0.5
             
             logger.info(f"Loaded feedback signals: {len(self.topic_scores)} topics analyzed")
+            self._write_signals_cache(fingerprint)
         
         except Exception as e:
             logger.error(f"Error loading feedback signals: {e}")
     
+    def _read_signals_cache(self, fingerprint: List[int]):
+        """Return cached topic scores if they were computed from this exact file"""
+        try:
+            cached = json.loads(self.signals_cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if cached.get('fingerprint') != fingerprint:
+            return None
+        return cached.get('topic_scores')
+    
+    def _write_signals_cache(self, fingerprint: List[int]):
+        """Persist topic scores alongside the feedback file"""
+        try:
+            self.signals_cache_path.write_text(
+                json.dumps({'fingerprint': fingerprint, 'topic_scores': self.topic_scores}),
+                encoding='utf-8'
+            )
+        except OSError as e:
+            logger.warning(f"Could not write feedback signals cache: {e}")
+    
     def rerank_results(
         self, 
         results: List[Dict[str, Any]], 
@@ -69,28 +112,73 @@ class FeedbackRanker:
         if not results or not self.topic_scores:
             return results  # No feedback data yet
         
-        # Score each result
-        scored_results = []
-        for result in results:
-            base_score = 1.0 - result.get('distance', 0.5)  # Lower distance = higher score
-            
-            # Apply feedback boost
-            feedback_boost = self._calculate_feedback_boost(result, query)
-            adjusted_score = base_score * (1.0 + feedback_boost * boost_factor)
-            
-            scored_results.append({
-                **result,
-                'original_score': base_score,
-                'feedback_boost': feedback_boost,
-                'final_score': adjusted_score
-            })
+        # Boosts depend only on each result's document, not on the query, so
+        # the same result set re-ranks identically for any phrasing of it.
+        # Documents are identified by id; results without ids are not cached.
+        ids = tuple(r.get('id') for r in results)
+        cache_key = None
+        if None not in ids:
+            cache_key = (boost_factor, ids, tuple(r.get('distance') for r in results))
+            with self._rerank_cache_lock:
+                cached = self._rerank_cache.get(cache_key)
+                if cached is not None:
+                    self._rerank_cache.move_to_end(cache_key)
+                    self._rerank_cache_hits += 1
+                else:
+                    self._rerank_cache_misses += 1
+            if cached is not None:
+                return [dict(result) for result in cached]
+        
+        # Score all results at once: distances and boosts as parallel arrays
+        distances = np.fromiter(
+            (result.get('distance', 0.5) for result in results),
+            dtype=np.float64,
+            count=len(results)
+        )
+        feedback_boosts = np.fromiter(
+            (self._calculate_feedback_boost(result, query) for result in results),
+            dtype=np.float64,
+            count=len(results)
+        )
+        base_scores = 1.0 - distances  # Lower distance = higher score
+        adjusted_scores = base_scores * (1.0 + feedback_boosts * boost_factor)
         
-        # Sort by final score (descending)
-        scored_results.sort(key=lambda x: x['final_score'], reverse=True)
+        # Sort by final score (descending), keeping ties in retrieval order
+        order = np.argsort(-adjusted_scores, kind='stable')
+        scored_results = [
+            {
+                **results[i],
+                'original_score': float(base_scores[i]),
+                'feedback_boost': float(feedback_boosts[i]),
+                'final_score': float(adjusted_scores[i])
+            }
+            for i in order
+        ]
+        
+        if cache_key is not None:
+            with self._rerank_cache_lock:
+                self._rerank_cache[cache_key] = [dict(result) for result in scored_results]
+                if len(self._rerank_cache) > RERANK_CACHE_SIZE:
+                    self._rerank_cache.popitem(last=False)
         
         logger.info(f"Re-ranked {len(results)} results using feedback signals")
         return scored_results
     
+    def clear_cache(self):
+        """Drop cached re-rankings (e.g. after feedback signals change)"""
+        with self._rerank_cache_lock:
+            self._rerank_cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get re-rank cache statistics for monitoring"""
+        with self._rerank_cache_lock:
+            return {
+                "cache_size": len(self._rerank_cache),
+                "max_cache_size": RERANK_CACHE_SIZE,
+                "hits": self._rerank_cache_hits,
+                "misses": self._rerank_cache_misses
+            }
+    
     def _calculate_feedback_boost(self, result: Dict, query: str) -> float:
         """
         Calculate feedback-based boost for a result
@@ -128,6 +216,9 @@ class FeedbackRanker:
         if not self.topic_scores:
             return {"status": "no_feedback_data"}
         
+        if self._ranking_stats is not None:
+            return copy.deepcopy(self._ranking_stats)
+        
         # Find best and worst performing topics
         sorted_topics = sorted(
             self.topic_scores.items(), 
@@ -135,12 +226,13 @@ class FeedbackRanker:
             reverse=True
         )
         
-        return {
+        self._ranking_stats = {
             "total_topics": len(self.topic_scores),
             "top_performing": sorted_topics[:5],
             "bottom_performing": sorted_topics[-5:],
             "average_score": sum(self.topic_scores.values()) / len(self.topic_scores)
         }
+        return copy.deepcopy(self._ranking_stats)
 
 
 # Singleton instance
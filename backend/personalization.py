@@ -18,6 +18,9 @@ from loguru import logger
 import re
 
 
+# Personalization token syntax: {token_name}
+_TOKEN_RE = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+
 # Default fallback values for common tokens
 DEFAULT_FALLBACKS = {
     "customer_name": "Valued Customer",
@@ -58,7 +61,7 @@ class Personalizer:
         self.context = context or {}
         self.fallbacks = {**DEFAULT_FALLBACKS, **(fallbacks or {})}
         self.strict_mode = strict_mode
-        self._token_pattern = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+        self._token_pattern = _TOKEN_RE
         
         logger.debug(f"Personalizer initialized with {len(self.context)} context values")
     
@@ -82,10 +85,7 @@ class Personalizer:
         # Merge contexts (additional_context takes priority)
         merged_context = {**self.context, **(additional_context or {})}
         
-        # Find all tokens in content
-        tokens = self._token_pattern.findall(content)
-        
-        if not tokens:
+        if not _TOKEN_RE.search(content):
             logger.debug("No personalization tokens found in content")
             return content
         
@@ -93,9 +93,13 @@ class Personalizer:
         replacements_made = {}
         missing_tokens = []
         
-        # Replace each token
-        personalized = content
-        for token in set(tokens):  # Deduplicate
+        def replace_token(match: re.Match) -> str:
+            token = match.group(1)
+            if token in replacements_made:
+                return replacements_made[token]
+            if token in missing_tokens:
+                return match.group(0)
+            
             value = self._get_token_value(token, merged_context)
             
             if value is None:
@@ -104,9 +108,13 @@ class Personalizer:
                     raise ValueError(f"Missing required personalization token: {token}")
                 # In non-strict mode, leave token as-is
                 logger.warning(f"No value found for token '{token}' - leaving unchanged")
-            else:
-                personalized = personalized.replace(f"{{{token}}}", value)
-                replacements_made[token] = value
+                return match.group(0)
+            
+            replacements_made[token] = value
+            return value
+        
+        # Replace every token in a single pass
+        personalized = _TOKEN_RE.sub(replace_token, content)
         
         # Log results
         if replacements_made:
@@ -148,7 +156,7 @@ class Personalizer:
         Returns:
             List of unique token names (without braces)
         """
-        tokens = self._token_pattern.findall(content)
+        tokens = _TOKEN_RE.findall(content)
         return list(set(tokens))
     
     def validate_tokens(self, content: str) -> Dict[str, bool]:
@@ -302,7 +302,7 @@ def retrieve_with_query_expansion(
         List of retrieved documents (deduplicated)
     """
     try:
-        from backend.vector_store import retrieve_similar
+        from backend.vector_store import retrieve_similar, retrieve_similar_batch
         from backend.query_expansion import get_query_expander
     except ImportError as e:
         logger.error(f"Failed to import dependencies: {e}")
@@ -323,23 +323,28 @@ def retrieve_with_query_expansion(
     
     logger.debug(f"Query expanded into {len(expanded_queries)} variants")
     
-    # Retrieve with each expanded query
+    # Retrieve all expanded queries in one embedding pass + collection query
+    try:
+        per_query_results = retrieve_similar_batch(collection_name, expanded_queries, k=k)
+    except Exception as e:
+        logger.warning(f"Batched retrieval failed, retrying queries one by one: {e}")
+        per_query_results = []
+        for exp_query in expanded_queries:
+            try:
+                per_query_results.append(retrieve_similar(collection_name, exp_query, k=k))
+            except Exception as e:
+                logger.warning(f"Retrieval failed for expanded query '{exp_query}': {e}")
+    
+    # Deduplicate by ID, keeping the first occurrence
     all_results = []
     seen_ids = set()
     
-    for exp_query in expanded_queries:
-        try:
-            results = retrieve_similar(collection_name, exp_query, k=k)
-            
-            # Deduplicate by ID
-            for doc in results:
-                doc_id = doc.get('id')
-                if doc_id not in seen_ids:
-                    seen_ids.add(doc_id)
-                    all_results.append(doc)
-        except Exception as e:
-            logger.warning(f"Retrieval failed for expanded query '{exp_query}': {e}")
-            continue
+    for results in per_query_results:
+        for doc in results:
+            doc_id = doc.get('id')
+            if doc_id not in seen_ids:
+                seen_ids.add(doc_id)
+                all_results.append(doc)
     
     # Sort by distance (best first) and limit to k * 2
     all_results.sort(key=lambda x: x.get('distance', 1.0))
@@ -4,13 +4,40 @@ Content validation module for safety checks
 Includes: length validation, forbidden phrases, and toxicity detection
 """
 import os
-from typing import Dict, List, Tuple
+import re
+import copy
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
 from loguru import logger
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
 # Validation configuration
 MIN_CONTENT_LENGTH = int(os.getenv("MIN_CONTENT_LENGTH", "10"))
 MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", "5000"))
 TOXICITY_THRESHOLD = float(os.getenv("TOXICITY_THRESHOLD", "0.7"))
+TOXICITY_MODEL = "unitary/toxic-bert"
+TOXICITY_MAX_TOKENS = 128  # Inputs are cut to 512 chars, roughly 128 tokens
+# Optional ONNX export (see scripts/export_toxicity_onnx.py); used when present
+TOXICITY_ONNX_PATH = os.getenv(
+    "TOXICITY_ONNX_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 "models", "toxic-bert", "model.int8.onnx")
+)
+VALIDATION_CACHE_SIZE = int(os.getenv("VALIDATION_CACHE_SIZE", "4096"))
 
 # Forbidden phrases/words list
 FORBIDDEN_PHRASES = [
@@ -24,6 +51,22 @@ FORBIDDEN_PHRASES = [
     # Add more as needed
 ]
 
+# First word of every forbidden phrase: a text with none of these as a whole
+# word cannot contain a phrase, so the full scan can be skipped
+_PHRASE_STARTERS = frozenset(p.lower().split()[0] for p in FORBIDDEN_PHRASES)
+_WORD_RE = re.compile(r"\w+")
+
+# validate_content outcomes keyed by BLAKE2b digest of the text (LRU).
+# The cache is per process: each Celery worker keeps its own, and clearing
+# the API's Redis cache does not touch it. It only holds pure functions of
+# the text, so it never needs invalidating for correctness.
+_validation_cache: "OrderedDict[bytes, Tuple[bool, object]]" = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
+# Multi-pattern matcher over FORBIDDEN_PHRASES, built lazily on first use
+_phrase_matcher = None
+_phrase_matcher_lock = threading.Lock()
+
 
 class ValidationError(Exception):
     """Raised when content fails validation"""
@@ -45,37 +88,91 @@ def validate_length(text: str) -> Tuple[bool, str]:
     """
     length = len(text)
     
+    # Common case: a single chained comparison, no further branching
+    if MIN_CONTENT_LENGTH <= length <= MAX_CONTENT_LENGTH:
+        return True, ""
+    
     if length < MIN_CONTENT_LENGTH:
         return False, f"Content too short ({length} chars, minimum {MIN_CONTENT_LENGTH})"
     
-    if length > MAX_CONTENT_LENGTH:
-        return False, f"Content too long ({length} chars, maximum {MAX_CONTENT_LENGTH})"
+    return False, f"Content too long ({length} chars, maximum {MAX_CONTENT_LENGTH})"
+
+
+def _build_phrase_matcher():
+    """
+    Build a single matcher for all forbidden phrases
     
-    return True, ""
+    Uses an Aho-Corasick automaton when pyahocorasick is installed (one pass
+    over the text finds every phrase), otherwise one precompiled regex
+    alternation.
+    """
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for idx, phrase in enumerate(FORBIDDEN_PHRASES):
+            automaton.add_word(phrase.lower(), (idx, phrase))
+        automaton.make_automaton()
+        return automaton
+    
+    # Longest phrases first so overlapping alternatives prefer the full phrase
+    alternation = "|".join(
+        re.escape(p.lower()) for p in sorted(FORBIDDEN_PHRASES, key=len, reverse=True)
+    )
+    return re.compile(r'\b(?:' + alternation + r')\b')
+
+
+def _get_phrase_matcher():
+    """Return the shared phrase matcher, building it once under a lock"""
+    global _phrase_matcher
+    
+    if _phrase_matcher is None:
+        with _phrase_matcher_lock:
+            if _phrase_matcher is None:
+                _phrase_matcher = _build_phrase_matcher()
+    
+    return _phrase_matcher
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
 
 
-def validate_forbidden_phrases(text: str) -> Tuple[bool, str, List[str]]:
+def validate_forbidden_phrases(text: str, lowered: bool = False) -> Tuple[bool, str, List[str]]:
     """
     Check for forbidden words/phrases in content
     Uses word boundary matching to avoid false positives (e.g., "hello" won't match "hell")
     
     Args:
         text: Content to validate
+        lowered: Set when the caller already lowercased text
         
     Returns:
         Tuple of (is_valid, error_message, found_phrases)
     """
-    import re
-    
-    text_lower = text.lower()
-    found_phrases = []
-    
-    for phrase in FORBIDDEN_PHRASES:
-        # Use word boundaries to avoid false positives
-        # \b matches word boundaries (start/end of word)
-        pattern = r'\b' + re.escape(phrase.lower()) + r'\b'
-        if re.search(pattern, text_lower):
-            found_phrases.append(phrase)
+    text_lower = text if lowered else text.lower()
+    
+    # Fast path for typical safe content: no phrase can start anywhere
+    if _PHRASE_STARTERS.isdisjoint(_WORD_RE.findall(text_lower)):
+        return True, "", []
+    
+    matcher = _get_phrase_matcher()
+    found_idx = set()
+    
+    if AHOCORASICK_AVAILABLE:
+        for end, (idx, phrase) in matcher.iter(text_lower):
+            start = end - len(phrase) + 1
+            # Enforce word boundaries on both sides of the match
+            if start > 0 and _is_word_char(text_lower[start - 1]):
+                continue
+            if end + 1 < len(text_lower) and _is_word_char(text_lower[end + 1]):
+                continue
+            found_idx.add(idx)
+    else:
+        phrases_lower = [p.lower() for p in FORBIDDEN_PHRASES]
+        for match in matcher.finditer(text_lower):
+            found_idx.add(phrases_lower.index(match.group(0)))
+    
+    # Report in FORBIDDEN_PHRASES order for stable messages
+    found_phrases = [FORBIDDEN_PHRASES[idx] for idx in sorted(found_idx)]
     
     if found_phrases:
         return False, f"Content contains forbidden phrases: {', '.join(found_phrases)}", found_phrases
@@ -83,80 +180,162 @@ def validate_forbidden_phrases(text: str) -> Tuple[bool, str, List[str]]:
     return True, "", []
 
 
-def validate_toxicity(text: str) -> Tuple[bool, str, float]:
+@functools.lru_cache(maxsize=1)
+def _get_toxicity_model():
+    """
+    Load the toxicity classifier once per process
+    
+    Linear layers are dynamically quantized to int8, which roughly halves
+    weight bandwidth and speeds up CPU inference.
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    
+    logger.info("Loading toxicity classifier model...")
+    tokenizer = AutoTokenizer.from_pretrained(TOXICITY_MODEL)
+    model = AutoModelForSequenceClassification.from_pretrained(TOXICITY_MODEL)
+    model.eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    logger.info("Toxicity classifier loaded successfully")
+    return tokenizer, model
+
+
+@functools.lru_cache(maxsize=1)
+def _get_toxicity_onnx_session():
+    """
+    Load the ONNX Runtime toxicity session once per process
+    
+    Returns None when onnxruntime or the exported model is missing, in which
+    case the quantized PyTorch model is used instead.
+    """
+    if not ONNXRUNTIME_AVAILABLE or not os.path.exists(TOXICITY_ONNX_PATH):
+        return None
+    
+    from transformers import AutoConfig, AutoTokenizer
+    
+    logger.info(f"Loading ONNX toxicity classifier: {TOXICITY_ONNX_PATH}")
+    so = ort.SessionOptions()
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.intra_op_num_threads = os.cpu_count() or 1
+    session = ort.InferenceSession(
+        TOXICITY_ONNX_PATH, sess_options=so, providers=["CPUExecutionProvider"]
+    )
+    tokenizer = AutoTokenizer.from_pretrained(TOXICITY_MODEL)
+    config = AutoConfig.from_pretrained(TOXICITY_MODEL)
+    logger.info("ONNX toxicity classifier loaded successfully")
+    return tokenizer, session, config
+
+
+def _score_toxicity_onnx(texts: List[str], tokenizer, session, config) -> List[Tuple[str, float]]:
+    """ONNX Runtime forward pass over a batch of texts"""
+    import numpy as np
+    
+    inputs = tokenizer(
+        texts,
+        padding=True,
+        truncation=True,
+        max_length=TOXICITY_MAX_TOKENS,
+        return_tensors="np",
+    )
+    feeds = {
+        node.name: inputs[node.name].astype(np.int64)
+        for node in session.get_inputs() if node.name in inputs
+    }
+    logits = session.run(None, feeds)[0]
+    
+    # Same activation the text-classification pipeline would pick
+    if config.problem_type == "multi_label_classification" or config.num_labels == 1:
+        probs = 1.0 / (1.0 + np.exp(-logits))
+    else:
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probs = exp / exp.sum(axis=-1, keepdims=True)
+    
+    top_ids = probs.argmax(axis=-1)
+    return [
+        (config.id2label[int(idx)], float(probs[row, idx]))
+        for row, idx in enumerate(top_ids)
+    ]
+
+
+def _score_toxicity(texts: List[str]) -> List[Tuple[str, float]]:
+    """Classify a batch of texts in one forward pass, returning (label, score) per text"""
+    # Truncate text if too long
+    samples = [text[:512] for text in texts]
+    
+    onnx = _get_toxicity_onnx_session()
+    if onnx is not None:
+        return _score_toxicity_onnx(samples, *onnx)
+    
+    import torch
+    
+    tokenizer, model = _get_toxicity_model()
+    
+    inputs = tokenizer(
+        samples,
+        padding=True,
+        truncation=True,
+        max_length=TOXICITY_MAX_TOKENS,
+        return_tensors="pt",
+    )
+    
+    with torch.inference_mode():
+        logits = model(**inputs).logits
+    
+    # Same activation the text-classification pipeline would pick
+    if model.config.problem_type == "multi_label_classification" or model.config.num_labels == 1:
+        probs = torch.sigmoid(logits)
+    else:
+        probs = torch.softmax(logits, dim=-1)
+    
+    top_scores, top_ids = probs.max(dim=-1)
+    return [
+        (model.config.id2label[int(idx)], float(score))
+        for idx, score in zip(top_ids, top_scores)
+    ]
+
+
+def validate_toxicity(
+    text: Union[str, List[str]]
+) -> Union[Tuple[bool, str, float], List[Tuple[bool, str, float]]]:
     """
     Check content for toxicity using transformer model
     
     Args:
-        text: Content to validate
+        text: Content to validate, or a list of contents to check in one batch
         
     Returns:
-        Tuple of (is_valid, error_message, toxicity_score)
+        Tuple of (is_valid, error_message, toxicity_score), or a list of
+        such tuples when a list is passed
     """
+    texts = [text] if isinstance(text, str) else list(text)
+    
     try:
-        from transformers import pipeline
-        
-        # Initialize toxicity classifier (cached after first use)
-        if not hasattr(validate_toxicity, "_classifier"):
-            logger.info("Loading toxicity classifier model...")
-            # Using unitary/toxic-bert model for toxicity detection
-            validate_toxicity._classifier = pipeline(
-                "text-classification",
-                model="unitary/toxic-bert",
-                device=-1,  # CPU
-                truncation=True,
-                max_length=512,
-            )
-            logger.info("Toxicity classifier loaded successfully")
-        
-        classifier = validate_toxicity._classifier
-        
-        # Truncate text if too long
-        text_sample = text[:512] if len(text) > 512 else text
-        
-        # Get toxicity prediction
-        result = classifier(text_sample)[0]
-        
-        # Result format: {"label": "toxic" or "non-toxic", "score": 0.0-1.0}
-        is_toxic = result["label"].lower() == "toxic"
-        score = result["score"] if is_toxic else (1.0 - result["score"])
-        
-        logger.info(f"Toxicity check: score={score:.3f}, threshold={TOXICITY_THRESHOLD}")
-        
-        if is_toxic and score >= TOXICITY_THRESHOLD:
-            return False, f"Content flagged as toxic (score: {score:.2f})", score
-        
-        return True, "", score
-        
+        predictions = _score_toxicity(texts)
     except Exception as e:
         logger.error(f"Toxicity validation error: {e}")
         # Fail open - if classifier fails, allow content through with warning
         logger.warning("Toxicity check failed, allowing content through")
-        return True, f"Toxicity check unavailable: {e}", 0.0
-
-
-def validate_content(text: str) -> Dict:
-    """
-    Run all validation checks on content
+        results = [(True, f"Toxicity check unavailable: {e}", 0.0) for _ in texts]
+        return results[0] if isinstance(text, str) else results
     
-    Args:
-        text: Content to validate
+    results = []
+    for label, raw_score in predictions:
+        # Result format: {"label": "toxic" or "non-toxic", "score": 0.0-1.0}
+        is_toxic = label.lower() == "toxic"
+        score = raw_score if is_toxic else (1.0 - raw_score)
         
-    Returns:
-        Dict with validation results:
-        {
-            "valid": bool,
-            "checks": {
-                "length": {"passed": bool, "message": str},
-                "forbidden_phrases": {"passed": bool, "message": str, "found": List[str]},
-                "toxicity": {"passed": bool, "message": str, "score": float}
-            },
-            "failure_reason": str (if invalid)
-        }
+        logger.info(f"Toxicity check: score={score:.3f}, threshold={TOXICITY_THRESHOLD}")
         
-    Raises:
-        ValidationError: If content fails any validation check
-    """
+        if is_toxic and score >= TOXICITY_THRESHOLD:
+            results.append((False, f"Content flagged as toxic (score: {score:.2f})", score))
+        else:
+            results.append((True, "", score))
+    
+    return results[0] if isinstance(text, str) else results
+
+
+def _run_validation_checks(text: str) -> Dict:
+    """Run length, forbidden phrase and toxicity checks (uncached)"""
     checks = {}
     
     # 1. Length validation
@@ -170,8 +349,11 @@ def validate_content(text: str) -> Dict:
         logger.warning(f"Length validation failed: {length_msg}")
         raise ValidationError("length_invalid", {"checks": checks})
     
-    # 2. Forbidden phrases check
-    phrases_valid, phrases_msg, found_phrases = validate_forbidden_phrases(text)
+    # 2. Forbidden phrases check (lowercase only once length has passed).
+    # str.lower() already takes an ASCII fast path in CPython; round-tripping
+    # through bytes.lower() measured slower, so no special-casing here.
+    text_lower = text.lower()
+    phrases_valid, phrases_msg, found_phrases = validate_forbidden_phrases(text_lower, lowered=True)
     checks["forbidden_phrases"] = {
         "passed": phrases_valid,
         "message": phrases_msg or "No forbidden phrases found",
@@ -202,6 +384,85 @@ def validate_content(text: str) -> Dict:
     }
 
 
+def _validation_cache_key(text: str) -> bytes:
+    """Fixed-size cache key so long texts don't stay resident in the cache"""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _store_validation_result(key: bytes, outcome: Tuple[bool, object]):
+    with _validation_cache_lock:
+        _validation_cache[key] = outcome
+        _validation_cache.move_to_end(key)
+        if len(_validation_cache) > VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+
+
+def clear_validation_cache():
+    """Drop this process's cached validate_content results"""
+    with _validation_cache_lock:
+        _validation_cache.clear()
+
+
+def validate_content(text: str) -> Dict:
+    """
+    Run all validation checks on content
+    
+    Checks are pure functions of the text, so outcomes (including rejections)
+    are cached by content hash; re-submitted content skips the phrase scan
+    and the toxicity model.
+    
+    Args:
+        text: Content to validate
+        
+    Returns:
+        Dict with validation results:
+        {
+            "valid": bool,
+            "checks": {
+                "length": {"passed": bool, "message": str},
+                "forbidden_phrases": {"passed": bool, "message": str, "found": List[str]},
+                "toxicity": {"passed": bool, "message": str, "score": float}
+            },
+            "failure_reason": str (if invalid)
+        }
+        
+    Raises:
+        ValidationError: If content fails any validation check
+    """
+    # Out-of-bounds length fails on len() alone: skip hashing and caching
+    if not MIN_CONTENT_LENGTH <= len(text) <= MAX_CONTENT_LENGTH:
+        return _run_validation_checks(text)
+    
+    key = _validation_cache_key(text)
+    
+    with _validation_cache_lock:
+        cached = _validation_cache.get(key)
+        if cached is not None:
+            _validation_cache.move_to_end(key)
+    
+    if cached is not None:
+        passed, payload = cached
+        if passed:
+            return copy.deepcopy(payload)
+        reason, details = payload
+        raise ValidationError(reason, copy.deepcopy(details))
+    
+    try:
+        result = _run_validation_checks(text)
+    except ValidationError as e:
+        _store_validation_result(key, (False, (e.reason, copy.deepcopy(e.details))))
+        raise
+    
+    # Don't pin a fail-open result from an unavailable toxicity model
+    if not result["checks"]["toxicity"]["message"].startswith("Toxicity check unavailable"):
+        _store_validation_result(key, (True, copy.deepcopy(result)))
+    
+    return result
+
+
+validate_content.cache_clear = clear_validation_cache
+
+
 def validate_support_reply(reply: str, intent: str, message: str, 
                           conversation_history: List[dict] = None) -> Dict:
     """
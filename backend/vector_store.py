@@ -247,16 +247,7 @@ def retrieve_similar(
             n_results=k
         )
         
-        # Format results
-        formatted_results = []
-        if results['ids'] and results['ids'][0]:
-            for i in range(len(results['ids'][0])):
-                formatted_results.append({
-                    'id': results['ids'][0][i],
-                    'text': results['documents'][0][i],
-                    'metadata': results['metadatas'][0][i] if results['metadatas'][0] else {},
-                    'distance': results['distances'][0][i] if results['distances'] else 0.0
-                })
+        formatted_results = _format_query_results(results, 0)
         
         logger.debug(f"Retrieved {len(formatted_results)} documents from '{collection_name}'")
         return formatted_results
@@ -266,6 +257,76 @@ def retrieve_similar(
         raise ValueError(f"Collection '{collection_name}' not found or query failed: {e}")
 
 
+def retrieve_similar_batch(
+    collection_name: str,
+    queries: List[str],
+    k: int = 5,
+    client = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Retrieve top-k similar documents for several queries in one call
+    
+    All queries are embedded together and sent as a single collection.query,
+    instead of one embedding + query round trip per retrieve_similar call.
+    
+    Args:
+        collection_name: Name of the collection to search
+        queries: Search query texts
+        k: Number of results to return per query
+        client: ChromaDB client (creates new if None)
+        
+    Returns:
+        One result list per query, in the same order as queries
+        
+    Raises:
+        ValueError: If collection doesn't exist
+    """
+    if client is None:
+        client = initialize_chroma_client()
+    
+    if not isinstance(collection_name, str):
+        logger.error(f"collection_name must be string, got {type(collection_name)}")
+        raise TypeError(f"collection_name must be string, got {type(collection_name)}")
+    
+    if not queries:
+        return []
+    
+    try:
+        collection = create_or_get_collection(collection_name, client)
+        
+        results = collection.query(
+            query_texts=list(queries),
+            n_results=k
+        )
+        
+        batch_results = [_format_query_results(results, q) for q in range(len(queries))]
+        
+        logger.debug(f"Retrieved results for {len(queries)} queries from '{collection_name}'")
+        return batch_results
+        
+    except Exception as e:
+        logger.error(f"Failed to retrieve from {collection_name}: {e}")
+        raise ValueError(f"Collection '{collection_name}' not found or query failed: {e}")
+
+
+def _format_query_results(results: Dict[str, Any], q: int) -> List[Dict[str, Any]]:
+    """Convert the q-th query of a collection.query response to result dicts"""
+    formatted_results = []
+    if results['ids'] and results['ids'][q]:
+        ids = results['ids'][q]
+        documents = results['documents'][q]
+        metadatas = results['metadatas'][q] if results['metadatas'] else None
+        distances = results['distances'][q] if results['distances'] else None
+        for i in range(len(ids)):
+            formatted_results.append({
+                'id': ids[i],
+                'text': documents[i],
+                'metadata': metadatas[i] if metadatas else {},
+                'distance': distances[i] if distances else 0.0
+            })
+    return formatted_results
+
+
 def retrieve_cross_collection(
     query: str,
     k: int = 3,
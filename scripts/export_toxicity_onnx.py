@@ -0,0 +1,71 @@
+# scripts/export_toxicity_onnx.py
+"""
+Export the toxicity classifier (unitary/toxic-bert) to ONNX
+
+One-time step. Writes an FP32 export plus an int8 dynamically quantized copy
+to models/toxic-bert/. backend.validators picks up model.int8.onnx
+automatically when onnxruntime is installed (override with TOXICITY_ONNX_PATH).
+
+Usage:
+    python scripts/export_toxicity_onnx.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from onnxruntime.quantization import quantize_dynamic, QuantType
+
+from backend.validators import TOXICITY_MODEL, TOXICITY_MAX_TOKENS
+
+OUTPUT_DIR = project_root / "models" / "toxic-bert"
+
+
+def export_onnx(output_path: Path):
+    """Trace the PyTorch model to ONNX with dynamic batch/sequence axes"""
+    tokenizer = AutoTokenizer.from_pretrained(TOXICITY_MODEL)
+    model = AutoModelForSequenceClassification.from_pretrained(TOXICITY_MODEL)
+    model.eval()
+
+    sample = tokenizer(
+        ["Example text for tracing"],
+        padding="max_length",
+        truncation=True,
+        max_length=TOXICITY_MAX_TOKENS,
+        return_tensors="pt",
+    )
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(output_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    print(f"✓ Exported FP32 model: {output_path}")
+
+
+def main():
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    fp32_path = OUTPUT_DIR / "model.onnx"
+    int8_path = OUTPUT_DIR / "model.int8.onnx"
+
+    export_onnx(fp32_path)
+
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    print(f"✓ Quantized int8 model: {int8_path}")
+
+
+if __name__ == "__main__":
+    main()
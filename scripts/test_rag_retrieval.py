@@ -3,13 +3,24 @@ Day 5: RAG Retrieval Validation Script
 Tests the /v1/retrieve endpoint with various queries
 """
 
-import requests
+import socket
+import argparse
+import httpx
 import json
+import orjson
+from urllib.parse import urlsplit
 from typing import List, Dict
 from loguru import logger
 
 BASE_URL = "http://localhost:8000"
 
+# Shared client: endpoints are addressed by path relative to BASE_URL
+CLIENT = httpx.Client(base_url=BASE_URL, timeout=10)
+_JSON_HDR = {"Content-Type": "application/json"}
+
+# Per-document result dumps; turned off with --quiet
+VERBOSE = True
+
 # Test cases covering different scenarios
 TEST_CASES = [
     {
@@ -49,10 +60,20 @@ TEST_CASES = [
     }
 ]
 
+def _server_up(host: str, port: int) -> bool:
+    """Fast TCP connect probe so a stopped server fails in milliseconds, not after the HTTP timeout"""
+    try:
+        with socket.create_connection((host, port), timeout=0.25):
+            return True
+    except OSError:
+        return False
+
+def _post(client: httpx.Client, path: str, payload: Dict) -> httpx.Response:
+    """POST a pre-serialized JSON body (orjson is much faster than httpx's stdlib json)"""
+    return client.post(path, content=orjson.dumps(payload), headers=_JSON_HDR)
+
 def test_retrieve(query: str, collection: str = None, top_k: int = 5) -> Dict:
     """Test the /v1/retrieve endpoint"""
-    endpoint = f"{BASE_URL}/v1/retrieve"
-    
     payload = {
         "query": query,
         "top_k": top_k
@@ -64,7 +85,7 @@ def test_retrieve(query: str, collection: str = None, top_k: int = 5) -> Dict:
     logger.info(f"🔍 Testing query: '{query}' | Collection: {collection or 'ALL'} | Top-K: {top_k}")
     
     try:
-        response = requests.post(endpoint, json=payload, timeout=10)
+        response = _post(CLIENT, "/v1/retrieve", payload)
         response.raise_for_status()
         
         data = response.json()
@@ -72,12 +93,15 @@ def test_retrieve(query: str, collection: str = None, top_k: int = 5) -> Dict:
         
         return data
     
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"❌ Request failed: {e}")
         return None
 
 def display_results(results: Dict):
     """Display retrieval results in a readable format"""
+    if not VERBOSE:
+        return
+    
     if not results or not results.get('results'):
         logger.warning("No results to display")
         return
@@ -109,9 +133,14 @@ def run_test_suite():
     print("  DAY 5: RAG RETRIEVAL VALIDATION")
     print("="*80 + "\n")
     
-    # Check server health
+    # Check server health (TCP probe first so a stopped server fails fast)
+    url = urlsplit(BASE_URL)
+    if not _server_up(url.hostname, url.port or (443 if url.scheme == "https" else 80)):
+        logger.error(f"❌ Server not reachable: nothing listening at {BASE_URL}")
+        return
+    
     try:
-        health = requests.get(f"{BASE_URL}/health", timeout=5).json()
+        health = CLIENT.get("/health", timeout=5).json()
         logger.info(f"Server Health: {health}")
         
         if not health.get("vector_db"):
@@ -165,4 +194,9 @@ def run_test_suite():
     print("="*80 + "\n")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate the /v1/retrieve endpoint")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only report pass/fail, skip per-document result dumps")
+    VERBOSE = not parser.parse_args().quiet
+    
     run_test_suite()
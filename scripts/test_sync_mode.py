@@ -4,9 +4,22 @@ Test Day 3 API in synchronous mode (no Redis/Celery needed)
 This tests the validation pipeline without background tasks
 """
 import httpx
+import orjson
 import sys
 
 API_URL = "http://127.0.0.1:8000"
+_JSON_HDR = {"Content-Type": "application/json"}
+
+# One pooled client so all test calls reuse the same keep-alive connection
+CLIENT = httpx.Client(
+    base_url=API_URL,
+    timeout=120,  # Longer timeout for LLM processing
+    limits=httpx.Limits(max_keepalive_connections=5)
+)
+
+def _post(path, payload, **kwargs):
+    """POST a JSON body serialized with orjson instead of httpx's stdlib json"""
+    return CLIENT.post(path, content=orjson.dumps(payload), headers=_JSON_HDR, **kwargs)
 
 def test_sync_reply_with_validation():
     """Test reply generation with validation in sync mode"""
@@ -40,11 +53,10 @@ def test_sync_reply_with_validation():
         
         try:
             # Use sync mode by setting async_mode=false
-            response = httpx.post(
-                f"{API_URL}/v1/generate/reply",
-                params={"async_mode": "false"},  # Force synchronous mode
-                json={"message": test['message']},
-                timeout=120  # Longer timeout for LLM processing
+            response = _post(
+                "/v1/generate/reply",
+                {"message": test['message']},
+                params={"async_mode": "false"}  # Force synchronous mode
             )
             
             if response.status_code != 200:
@@ -89,7 +101,7 @@ def test_health_and_ready():
     
     # Health check
     try:
-        response = httpx.get(f"{API_URL}/health", timeout=5)
+        response = CLIENT.get("/health", timeout=5)
         if response.status_code == 200:
             print(f"✅ /health endpoint: {response.json()}")
         else:
@@ -100,7 +112,7 @@ def test_health_and_ready():
     
     # Ready check
     try:
-        response = httpx.get(f"{API_URL}/ready", timeout=10)
+        response = CLIENT.get("/ready", timeout=10)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ /ready endpoint: model_ok={data.get('model_ok')}, latency={data.get('latency_s')}s")
@@ -7,6 +7,9 @@ sys.path.insert(0, 'D:/Malind Tech/AI_Models_Ata')
 
 from backend.validators import validate_content, ValidationError
 
+# Oversized fixture for the length-rejection case, built once
+_LONG_INPUT = "X" * 6000
+
 print("\n" + "="*70)
 print("DEMONSTRATION: VALIDATION REJECTION SCENARIOS")
 print("="*70)
@@ -43,7 +46,7 @@ test_cases = [
     },
     {
         "name": "❌ REJECT: Too long (6000 chars)",
-        "content": "X" * 6000,
+        "content": _LONG_INPUT,
         "should_pass": False,
         "expected_reason": "length_invalid"
     },
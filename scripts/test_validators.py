@@ -12,6 +12,9 @@ from backend.validators import (
     ValidationError
 )
 
+# Oversized fixture for the length-rejection case, built once
+_LONG_INPUT = "X" * 6000
+
 print("=" * 70)
 print("TESTING VALIDATORS (No Redis/Celery needed)")
 print("=" * 70)
@@ -36,8 +39,7 @@ except ValidationError as e:
 # Test 3: Too long
 print("\n🧪 Test 3: Content too long")
 try:
-    long_text = "X" * 6000
-    result = validate_content(long_text)
+    result = validate_content(_LONG_INPUT)
     print("❌ FAILED - Should have been rejected")
 except ValidationError as e:
     print(f"✅ PASSED - Rejected: {e.reason}")
@@ -86,12 +88,15 @@ try:
     safe_text = "Thank you for your patience while we resolve this."
     toxic_text = "You're an idiot and I hate you"
     
+    # Both texts go through the classifier in a single batched forward pass
+    safe_result, toxic_result = validate_toxicity([safe_text, toxic_text])
+    
     print("\n   Testing safe text...")
-    is_valid, msg, score = validate_toxicity(safe_text)
+    is_valid, msg, score = safe_result
     print(f"   {'✅' if is_valid else '❌'} Safe text - Score: {score:.3f}, Result: {msg or 'PASS'}")
     
     print("\n   Testing toxic text...")
-    is_valid, msg, score = validate_toxicity(toxic_text)
+    is_valid, msg, score = toxic_result
     print(f"   {'✅' if not is_valid else '⚠️'} Toxic text - Score: {score:.3f}, Result: {msg or 'Low toxicity'}")
     
 except Exception as e:
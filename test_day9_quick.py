@@ -130,18 +130,16 @@ print("-" * 40)
 try:
     from cache import RedisRateLimiter
     
-    limiter = RedisRateLimiter(
-        max_requests=5,
-        window_seconds=60,
-        block_duration_seconds=300
-    )
+    limiter = RedisRateLimiter()
     
-    # Test limiting
+    # Test limiting with the same check the API middleware uses
     client_id = "test_client"
+    limiter.reset(client_id)
     allowed_count = 0
     
     for i in range(7):
-        if limiter.is_allowed(client_id):
+        allowed, _ = limiter.check_limit(client_id, max_requests=5, window_seconds=60)
+        if allowed:
             allowed_count += 1
     
     print(f"✅ Rate limiter initialized")
@@ -6,9 +6,16 @@ import sys
 sys.path.insert(0, "D:\\Malind Tech\\AI_Models_Ata")
 
 from backend.feedback_ranker import get_feedback_ranker
-from colorama import init, Fore, Style
 
-init(autoreset=True)
+if sys.stdout.isatty():
+    from colorama import init, Fore, Style
+    init(autoreset=True)
+else:
+    # Piped to a file/CI log: drop ANSI color codes
+    class _NoColor:
+        def __getattr__(self, name):
+            return ''
+    Fore = Style = _NoColor()
 
 print(f"""
 {Fore.CYAN}╔══════════════════════════════════════════════════════════════╗
@@ -85,4 +92,12 @@ for i, r in enumerate(reranked, 1):
           f"{boost_color}Boost: {boost:+.3f}{Style.RESET_ALL}, "
           f"Final: {final:.3f}")
 
+# Paraphrased query over the same results is served from the re-rank cache
+# (nothing is re-ranked, or cached, without feedback data)
+if ranker.topic_scores:
+    hits_before = ranker.get_cache_stats()['hits']
+    ranker.rerank_results(mock_results, "AI-powered customer service")
+    cache_hit = ranker.get_cache_stats()['hits'] == hits_before + 1
+    print(f"\nCached re-rank for paraphrased query: {'✅ cache hit' if cache_hit else '❌ recomputed'}")
+
 print(f"\n{Fore.GREEN}✅ Retrieval ranking is ACTIVE and learning from feedback!{Style.RESET_ALL}\n")
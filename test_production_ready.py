@@ -1,25 +1,48 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 import time
 
+BASE_URL = 'http://localhost:8000'
+
+session = requests.Session()
+session.headers.update({'Content-Type': 'application/json'})
+session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def _post(path, payload):
+    return session.post(f'{BASE_URL}{path}', data=orjson.dumps(payload))
+
+
+def poll_until_complete(session, task_id, interval=0.1, max_interval=1.0, timeout=30):
+    """Poll a task until it completes or fails, backing off from interval to max_interval"""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = orjson.loads(session.get(f'{BASE_URL}/v1/tasks/{task_id}').content)
+        if result.get('status') in ('completed', 'failed'):
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return result
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
 # Test 1: Order with "Unknown - system offline" (ORD-10003)
 print("=" * 60)
 print("TEST 1: Order ORD-10003 (Processing, Unknown delivery)")
 print("=" * 60)
 
-response1 = requests.post(
-    'http://localhost:8000/v1/generate/reply',
-    json={'message': 'Where is my order ORD-10003?', 'conversation_id': 'test_offline_1'}
+response1 = _post(
+    '/v1/generate/reply',
+    {'message': 'Where is my order ORD-10003?', 'conversation_id': 'test_offline_1'}
 )
-task_id_1 = response1.json().get('task_id')
+task_id_1 = orjson.loads(response1.content).get('task_id')
 print(f"✓ Task submitted: {task_id_1}")
 
 # Wait for processing
-print("⏳ Waiting 15 seconds for processing...")
-time.sleep(15)
-
-# Get result
-result1 = requests.get(f'http://localhost:8000/v1/tasks/{task_id_1}').json()
+print("⏳ Waiting for processing...")
+result1 = poll_until_complete(session, task_id_1)
 print(f"\nStatus: {result1.get('status')}")
 
 if result1.get('status') == 'completed' and result1.get('result'):
@@ -46,17 +69,15 @@ print("\n" + "=" * 60)
 print("TEST 2: Order ORD-10001 (Delivered with actual date)")
 print("=" * 60)
 
-response2 = requests.post(
-    'http://localhost:8000/v1/generate/reply',
-    json={'message': 'Where is my order ORD-10001?', 'conversation_id': 'test_delivered_1'}
+response2 = _post(
+    '/v1/generate/reply',
+    {'message': 'Where is my order ORD-10001?', 'conversation_id': 'test_delivered_1'}
 )
-task_id_2 = response2.json().get('task_id')
+task_id_2 = orjson.loads(response2.content).get('task_id')
 print(f"✓ Task submitted: {task_id_2}")
 
-print("⏳ Waiting 15 seconds for processing...")
-time.sleep(15)
-
-result2 = requests.get(f'http://localhost:8000/v1/tasks/{task_id_2}').json()
+print("⏳ Waiting for processing...")
+result2 = poll_until_complete(session, task_id_2)
 print(f"\nStatus: {result2.get('status')}")
 
 if result2.get('status') == 'completed' and result2.get('result'):
@@ -1,48 +1,110 @@
-import requests
-import json
+import asyncio
+import httpx
+import orjson
+import sys
 
-# Test 1: Order with "Unknown - system offline" (ORD-10003)
-print("=" * 70)
-print("TEST 1: Order ORD-10003 (Processing, Unknown delivery)")
-print("=" * 70)
+# Faster event loop for the concurrent requests (not available on Windows)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+BASE_URL = 'http://localhost:8000'
+JSON_HEADERS = {'Content-Type': 'application/json'}
 
-response1 = requests.post(
-    'http://localhost:8000/v1/generate/reply?async_mode=false',
-    json={'message': 'Where is my order ORD-10003?', 'conversation_id': 'test_sync_1'}
+DAYS = frozenset({'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'})
+CARRIERS = frozenset({'fedex'})
+NO_LIVE_TRACKING = frozenset({"don't have access to live", "don't have live"})
+DELIVERY_DATES = frozenset({'november 4', 'nov 4', '2024-11-04'})
+TIMEFRAMES = frozenset({'3-5', 'typical', 'usually'})
+KEYWORDS = (
+    DAYS | CARRIERS | NO_LIVE_TRACKING | DELIVERY_DATES | TIMEFRAMES
+    | {'unknown', 'system offline', 'delivered'}
 )
 
-print(f"\nStatus Code: {response1.status_code}")
+# Build the keyword automaton once; every reply is then scanned in one pass
+if AHOCORASICK_AVAILABLE:
+    KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for keyword in KEYWORDS:
+        KEYWORD_AUTOMATON.add_word(keyword, keyword)
+    KEYWORD_AUTOMATON.make_automaton()
+
+
+def find_keywords(reply_lc):
+    """Return the set of KEYWORDS occurring in a lowercased reply"""
+    if AHOCORASICK_AVAILABLE:
+        return {keyword for _, keyword in KEYWORD_AUTOMATON.iter(reply_lc)}
+    return {keyword for keyword in KEYWORDS if keyword in reply_lc}
+
+
+async def fire(client, conversation_id, message):
+    return await client.post(
+        '/v1/generate/reply?async_mode=false',
+        content=orjson.dumps({'message': message, 'conversation_id': conversation_id})
+    )
+
+
+async def fire_all():
+    # Both tests are independent, so submit them together and overlap generation
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers=JSON_HEADERS,
+        timeout=None,
+        limits=httpx.Limits(max_connections=10)
+    ) as client:
+        return await asyncio.gather(
+            fire(client, 'test_sync_1', 'Where is my order ORD-10003?'),
+            fire(client, 'test_sync_2', 'Where is my order ORD-10001?')
+        )
+
+
+response1, response2 = asyncio.run(fire_all())
+
+# Test 1: Order with "Unknown - system offline" (ORD-10003)
+out = []
+out.append("=" * 70)
+out.append("TEST 1: Order ORD-10003 (Processing, Unknown delivery)")
+out.append("=" * 70)
+
+out.append(f"\nStatus Code: {response1.status_code}")
 
 if response1.status_code == 200:
-    data = response1.json()
+    data = orjson.loads(response1.content)
     reply = data.get('response', {}).get('reply', 'No reply')
     next_steps = data.get('response', {}).get('next_steps', 'N/A')
+    hits = find_keywords(reply.lower())
     
-    print("\n📧 AGENT REPLY:")
-    print("-" * 70)
-    print(reply)
-    print("-" * 70)
+    out.append("\n📧 AGENT REPLY:")
+    out.append("-" * 70)
+    out.append(reply)
+    out.append("-" * 70)
     
-    print("\n📋 NEXT STEPS:")
-    print(next_steps)
+    out.append("\n📋 NEXT STEPS:")
+    out.append(next_steps)
     
     # Validation
-    print("\n🔍 ANTI-HALLUCINATION VALIDATION:")
-    print("-" * 70)
+    out.append("\n🔍 ANTI-HALLUCINATION VALIDATION:")
+    out.append("-" * 70)
     
     checks = []
     
     # Check 1: Acknowledges limited tracking
-    if "don't have access to live" in reply.lower() or "don't have live" in reply.lower():
+    if NO_LIVE_TRACKING & hits:
         checks.append("✅ Acknowledges no live tracking access")
-    elif "unknown" in reply.lower() and "system offline" in reply.lower():
+    elif "unknown" in hits and "system offline" in hits:
         checks.append("✅ Mentions 'Unknown - system offline'")
     else:
         checks.append("⚠️  Should acknowledge limited tracking")
     
     # Check 2: No specific delivery days
-    days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-    if any(day in reply.lower() for day in days):
+    if DAYS & hits:
         checks.append("❌ HALLUCINATION: Invented specific delivery day")
     else:
         checks.append("✅ No invented delivery dates")
@@ -54,52 +116,51 @@ if response1.status_code == 200:
         checks.append("✅ No invented tracking numbers")
     
     # Check 4: Mentions typical timeframe
-    if "3-5" in reply or "typical" in reply.lower() or "usually" in reply.lower():
+    if TIMEFRAMES & hits:
         checks.append("✅ Provides general timeframe expectations")
     else:
         checks.append("⚠️  Could mention typical processing time")
     
-    for check in checks:
-        print(check)
+    out.extend(checks)
     
-    print("-" * 70)
+    out.append("-" * 70)
 else:
-    print(f"❌ Error: {response1.status_code}")
-    print(response1.text)
+    out.append(f"❌ Error: {response1.status_code}")
+    out.append(response1.text)
 
-print("\n" + "=" * 70)
-print("TEST 2: Order ORD-10001 (Delivered with actual date)")
-print("=" * 70)
+sys.stdout.write("\n".join(out) + "\n")
+sys.stdout.flush()
 
-response2 = requests.post(
-    'http://localhost:8000/v1/generate/reply?async_mode=false',
-    json={'message': 'Where is my order ORD-10001?', 'conversation_id': 'test_sync_2'}
-)
+out = []
+out.append("\n" + "=" * 70)
+out.append("TEST 2: Order ORD-10001 (Delivered with actual date)")
+out.append("=" * 70)
 
-print(f"\nStatus Code: {response2.status_code}")
+out.append(f"\nStatus Code: {response2.status_code}")
 
 if response2.status_code == 200:
-    data = response2.json()
+    data = orjson.loads(response2.content)
     reply = data.get('response', {}).get('reply', 'No reply')
+    hits = find_keywords(reply.lower())
     
-    print("\n📧 AGENT REPLY:")
-    print("-" * 70)
-    print(reply)
-    print("-" * 70)
+    out.append("\n📧 AGENT REPLY:")
+    out.append("-" * 70)
+    out.append(reply)
+    out.append("-" * 70)
     
-    print("\n🔍 DATA GROUNDING VALIDATION:")
-    print("-" * 70)
+    out.append("\n🔍 DATA GROUNDING VALIDATION:")
+    out.append("-" * 70)
     
     checks = []
     
     # Check 1: Mentions delivered status
-    if "delivered" in reply.lower():
+    if "delivered" in hits:
         checks.append("✅ Confirms delivered status")
     else:
         checks.append("❌ Should mention delivered status")
     
     # Check 2: Includes actual delivery date
-    if "november 4" in reply.lower() or "nov 4" in reply.lower() or "2024-11-04" in reply:
+    if DELIVERY_DATES & hits:
         checks.append("✅ Provides exact delivery date (Nov 4)")
     else:
         checks.append("⚠️  Should include delivery date (Nov 4, 2024)")
@@ -111,18 +172,20 @@ if response2.status_code == 200:
         checks.append("⚠️  Could include tracking number")
     
     # Check 4: Mentions carrier
-    if "fedex" in reply.lower():
+    if CARRIERS & hits:
         checks.append("✅ Mentions carrier (FedEx)")
     else:
         checks.append("⚠️  Could mention carrier")
     
-    for check in checks:
-        print(check)
+    out.extend(checks)
     
-    print("-" * 70)
+    out.append("-" * 70)
 else:
-    print(f"❌ Error: {response2.status_code}")
-    print(response2.text)
+    out.append(f"❌ Error: {response2.status_code}")
+    out.append(response2.text)
+
+sys.stdout.write("\n".join(out) + "\n")
+sys.stdout.flush()
 
 print("\n" + "=" * 70)
 print("✅ Production-Ready Testing Complete!")
@@ -5,16 +5,42 @@ Simulates 10-20 concurrent users per agent (20-40 total)
 Validates performance under load and cache effectiveness
 """
 
-from locust import HttpUser, task, between, events
-import json
+from locust import task, constant_throughput, events
+from locust.contrib.fasthttp import FastHttpUser
+from locust.exception import CatchResponseError
+import gevent
+import orjson
+import os
 import random
+import time
+from collections import defaultdict
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Test data pools
-CONTENT_TOPICS = [
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Failure messages for common non-200 responses, shared so Locust groups them
+STATUS_MESSAGES = {
+    0: "Connection error",
+    400: "Bad request",
+    404: "Not found",
+    422: "Validation error",
+    429: "Rate limited",
+    500: "Server error",
+    502: "Bad gateway",
+    503: "Unavailable",
+    504: "Gateway timeout",
+}
+
+
+def status_message(status_code):
+    """Failure message for a non-200 status code"""
+    return STATUS_MESSAGES.get(status_code) or f"HTTP {status_code}"
+
+# Test data pools (immutable tuples, shared by every virtual user)
+CONTENT_TOPICS = (
     "sustainable living tips",
     "home office productivity",
     "healthy breakfast recipes",
@@ -25,12 +51,12 @@ CONTENT_TOPICS = [
     "minimalist lifestyle",
     "meditation techniques",
     "eco-friendly products"
-]
+)
 
-CONTENT_TYPES = ["blog", "product_description", "ad_copy", "email_newsletter", "social_media"]
-TONES = ["professional", "casual", "friendly", "formal", "empathetic"]
+CONTENT_TYPES = ("blog", "product_description", "ad_copy", "email_newsletter", "social_media")
+TONES = ("professional", "casual", "friendly", "formal", "empathetic")
 
-SUPPORT_MESSAGES = [
+SUPPORT_MESSAGES = (
     "Where is my order #ORD-12345? It's been 2 weeks!",
     "I received a damaged product. Can I get a refund?",
     "How do I track my shipment?",
@@ -41,9 +67,23 @@ SUPPORT_MESSAGES = [
     "How long does shipping usually take?",
     "Do you offer international shipping?",
     "I need to cancel my order immediately."
-]
+)
+
+PRODUCTS = ("wireless headphones", "coffee maker", "running shoes", "laptop backpack", "yoga mat")
+AD_CAMPAIGNS = ("summer sale", "new product launch", "limited offer", "holiday special", "flash discount")
+CONTENT_COLLECTIONS = ("blogs", "products", "social")
+BOOLEANS = (True, False)
+SUPPORT_RAG_MESSAGES = SUPPORT_MESSAGES[:5]  # Use subset for caching
 
-RAG_QUERIES = [
+# Target request rate per virtual user (20 users -> 40 RPS, 40 users -> 80 RPS)
+# constant_throughput keeps this rate regardless of response time, unlike a
+# fixed sleep between requests
+RPS_PER_USER = float(os.getenv("LOCUST_RPS_PER_USER", "2.0"))
+
+# Number of random picks drawn per refill in PooledUser.pick
+PICK_BATCH_SIZE = 1024
+
+RAG_QUERIES = (
     "shipping policy",
     "return process",
     "order tracking",
@@ -54,34 +94,141 @@ RAG_QUERIES = [
     "customer service contact",
     "product recommendations",
     "order status"
-]
+)
+
+# Paraphrases of canonical support questions for the cache-effectiveness task.
+# Repeats of a seed should be served from cache; paraphrases show whether the
+# cache also matches semantically similar wording.
+PARAPHRASES = {
+    "shipping policy": (
+        "What is your shipping policy?",
+        "How do you ship orders?",
+        "Tell me about shipping.",
+        "What are your shipping rules?",
+        "Can you explain your shipping policy?",
+    ),
+    "return process": (
+        "How do I return an item?",
+        "What is the return process?",
+        "Can I send a product back?",
+        "How do returns work?",
+        "Explain how to return my order.",
+    ),
+    "order tracking": (
+        "How do I track my order?",
+        "Where can I track my shipment?",
+        "Is there a way to follow my package?",
+        "How can I see where my order is?",
+        "Track my order please.",
+    ),
+    "refund policy": (
+        "What is your refund policy?",
+        "How do refunds work?",
+        "Can I get my money back?",
+        "When will I be refunded?",
+        "Explain your refund rules.",
+    ),
+    "product warranty": (
+        "Does this product have a warranty?",
+        "What does the warranty cover?",
+        "How long is the warranty?",
+        "Is my item under warranty?",
+        "Tell me about the product warranty.",
+    ),
+    "delivery time": (
+        "How long does delivery take?",
+        "When will my order arrive?",
+        "What is the usual delivery time?",
+        "How many days for shipping?",
+        "How fast is delivery?",
+    ),
+    "payment methods": (
+        "What payment methods do you accept?",
+        "Can I pay with PayPal?",
+        "Which cards do you take?",
+        "How can I pay for my order?",
+        "What are the payment options?",
+    ),
+    "customer service contact": (
+        "How do I contact customer service?",
+        "What is your support phone number?",
+        "How can I reach support?",
+        "Can I talk to a person?",
+        "Where do I get help with my order?",
+    ),
+    "cancel order": (
+        "How do I cancel my order?",
+        "Can I cancel an order I just placed?",
+        "I want to cancel my purchase.",
+        "Please cancel my order.",
+        "Is it too late to cancel?",
+    ),
+    "change address": (
+        "Can I change my shipping address?",
+        "How do I update my delivery address?",
+        "I entered the wrong address.",
+        "Please ship to a different address.",
+        "Change the address on my order.",
+    ),
+}
+PARAPHRASE_SEEDS = tuple(PARAPHRASES)
+
+# Responses faster than this count as cache hits when the API does not report
+# cache_hit itself (cold classification needs an LLM call)
+CACHE_HIT_THRESHOLD_MS = float(os.getenv("LOCUST_CACHE_HIT_MS", "50"))
 
+# seed -> {"hits": int, "misses": int}, aggregated across all users
+CACHE_STATS = defaultdict(lambda: {"hits": 0, "misses": 0})
 
-class ContentGenerationUser(HttpUser):
+
+class PooledUser(FastHttpUser):
+    """
+    Base user that draws random test data in batches
+    Refills each pool's picks with one random.choices call instead of
+    calling random.choice on every request
+    """
+    abstract = True
+
+    def on_start(self):
+        self._pick_iters = {}
+
+    def pick(self, pool):
+        """Return a random element of pool"""
+        picks = self._pick_iters.get(id(pool))
+        value = next(picks, None) if picks is not None else None
+        if value is None:
+            picks = iter(random.choices(pool, k=PICK_BATCH_SIZE))
+            self._pick_iters[id(pool)] = picks
+            value = next(picks)
+        return value
+
+
+class ContentGenerationUser(PooledUser):
     """
     Simulates users generating content
     Tests content generation agent performance
     """
-    wait_time = between(1, 3)  # Wait 1-3 seconds between requests
+    wait_time = constant_throughput(RPS_PER_USER)
     
     @task(4)  # 40% of requests
     def generate_blog(self):
         """Generate blog post"""
         payload = {
             "content_type": "blog",
-            "topic": random.choice(CONTENT_TOPICS),
-            "tone": random.choice(TONES),
-            "enable_expansion": random.choice([True, False])
+            "topic": self.pick(CONTENT_TOPICS),
+            "tone": self.pick(TONES),
+            "enable_expansion": self.pick(BOOLEANS)
         }
         
         with self.client.post(
             "/v1/generate/content",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Generate Blog"
         ) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 latency = data.get("latency_s", 0)
                 body_length = len(data.get("body", ""))
                 
@@ -92,73 +239,74 @@ class ContentGenerationUser(HttpUser):
                 else:
                     response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
     
     @task(3)  # 30% of requests
     def generate_product_description(self):
         """Generate product description"""
         payload = {
             "content_type": "product_description",
-            "topic": random.choice(["wireless headphones", "coffee maker", "running shoes", 
-                                   "laptop backpack", "yoga mat"]),
+            "topic": self.pick(PRODUCTS),
             "tone": "professional",
             "enable_expansion": True
         }
         
         with self.client.post(
             "/v1/generate/content",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Generate Product Description"
         ) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if data.get("latency_s", 0) > 3.0:
                     response.failure(f"Slow response: {data['latency_s']:.2f}s")
                 else:
                     response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
     
     @task(2)  # 20% of requests
     def generate_ad_copy(self):
         """Generate advertisement copy"""
         payload = {
             "content_type": "ad_copy",
-            "topic": random.choice(["summer sale", "new product launch", "limited offer", 
-                                   "holiday special", "flash discount"]),
+            "topic": self.pick(AD_CAMPAIGNS),
             "tone": "friendly"
         }
         
         with self.client.post(
             "/v1/generate/content",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Generate Ad Copy"
         ) as response:
             if response.status_code == 200:
                 response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
     
     @task(1)  # 10% of requests
     def retrieve_documents(self):
         """Test RAG retrieval"""
         payload = {
-            "query": random.choice(RAG_QUERIES),
-            "collection": random.choice(["blogs", "products", "social"]),
+            "query": self.pick(RAG_QUERIES),
+            "collection": self.pick(CONTENT_COLLECTIONS),
             "top_k": 5,
-            "enable_hybrid": random.choice([True, False])
+            "enable_hybrid": self.pick(BOOLEANS)
         }
         
         with self.client.post(
             "/v1/retrieve",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="RAG Retrieval"
         ) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 latency = data.get("latency_ms", 0)
                 num_results = data.get("num_results", 0)
                 
@@ -169,31 +317,32 @@ class ContentGenerationUser(HttpUser):
                 else:
                     response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
 
 
-class SupportReplyUser(HttpUser):
+class SupportReplyUser(PooledUser):
     """
     Simulates users requesting support replies
     Tests customer support agent performance
     """
-    wait_time = between(1, 3)
+    wait_time = constant_throughput(RPS_PER_USER)
     
     @task(5)  # 50% of requests
     def generate_support_reply(self):
         """Generate support reply (synchronous)"""
         payload = {
-            "message": random.choice(SUPPORT_MESSAGES)
+            "message": self.pick(SUPPORT_MESSAGES)
         }
         
         with self.client.post(
             "/v1/generate/reply?async_mode=false",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Generate Support Reply"
         ) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 total_latency = data.get("total_latency_s", 0)
                 detected_intent = data.get("detected_intent", "")
                 reply = data.get("reply", "")
@@ -206,26 +355,25 @@ class SupportReplyUser(HttpUser):
                     response.failure("No intent detected")
                 else:
                     response.success()
-            elif response.status_code == 429:
-                response.failure("Rate limited")
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
     
     @task(3)  # 30% of requests
     def classify_intent(self):
         """Test intent classification (cached heavily)"""
         payload = {
-            "message": random.choice(SUPPORT_MESSAGES)
+            "message": self.pick(SUPPORT_MESSAGES)
         }
         
         with self.client.post(
             "/v1/classify/intent",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Classify Intent"
         ) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 latency = data.get("latency_s", 0)
                 intent = data.get("intent", "")
                 
@@ -236,25 +384,26 @@ class SupportReplyUser(HttpUser):
                 else:
                     response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
     
     @task(2)  # 20% of requests
     def retrieve_support_context(self):
         """Test RAG retrieval for support context"""
         payload = {
-            "query": random.choice(SUPPORT_MESSAGES[:5]),  # Use subset for caching
+            "query": self.pick(SUPPORT_RAG_MESSAGES),
             "collection": "support",
             "top_k": 3
         }
         
         with self.client.post(
             "/v1/retrieve",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Support RAG Retrieval"
         ) as response:
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 latency = data.get("latency_ms", 0)
                 
                 if latency > 50:  # Should be fast with caching
@@ -262,64 +411,124 @@ class SupportReplyUser(HttpUser):
                 else:
                     response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
+    
+    @task(1)
+    def measure_cache_hit_rate(self):
+        """Classify paraphrased queries and record cache hits per seed"""
+        seed = self.pick(PARAPHRASE_SEEDS)
+        payload = {
+            "message": self.pick(PARAPHRASES[seed])
+        }
+        
+        start = time.perf_counter()
+        with self.client.post(
+            "/v1/classify/intent",
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
+            catch_response=True,
+            name="Cache: Paraphrased Intent"
+        ) as response:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                hit = data.get("cache_hit")
+                if hit is None:
+                    hit = elapsed_ms < CACHE_HIT_THRESHOLD_MS
+                CACHE_STATS[seed]["hits" if hit else "misses"] += 1
+                response.success()
+            else:
+                response.failure(status_message(response.status_code))
 
 
-class MixedWorkloadUser(HttpUser):
+class MixedWorkloadUser(PooledUser):
     """
     Simulates mixed workload - both content generation and support
     More realistic production scenario
     """
-    wait_time = between(2, 5)
+    wait_time = constant_throughput(RPS_PER_USER / 2)  # Lighter, browsing-style pace
     
     @task(3)
     def generate_content(self):
         """Generate content"""
         payload = {
-            "content_type": random.choice(CONTENT_TYPES),
-            "topic": random.choice(CONTENT_TOPICS),
-            "tone": random.choice(TONES)
+            "content_type": self.pick(CONTENT_TYPES),
+            "topic": self.pick(CONTENT_TOPICS),
+            "tone": self.pick(TONES)
         }
         
         with self.client.post(
             "/v1/generate/content",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Mixed: Generate Content"
         ) as response:
             if response.status_code == 200:
                 response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
     
     @task(2)
     def support_reply(self):
         """Generate support reply"""
         payload = {
-            "message": random.choice(SUPPORT_MESSAGES)
+            "message": self.pick(SUPPORT_MESSAGES)
         }
         
         with self.client.post(
             "/v1/generate/reply?async_mode=false",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             catch_response=True,
             name="Mixed: Support Reply"
         ) as response:
             if response.status_code == 200:
                 response.success()
-            elif response.status_code == 429:
-                response.failure("Rate limited")
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
+    
+    @task(2)
+    def parallel_retrieve_and_reply(self):
+        """Retrieve support context and generate a reply concurrently"""
+        message = self.pick(SUPPORT_MESSAGES)
+        retrieve_payload = orjson.dumps({"query": message, "collection": "support", "top_k": 3})
+        reply_payload = orjson.dumps({"message": message})
+        
+        start = time.monotonic()
+        jobs = [
+            gevent.spawn(self.client.post, "/v1/retrieve", data=retrieve_payload,
+                         headers=JSON_HEADERS, name="Mixed: Parallel Retrieval"),
+            gevent.spawn(self.client.post, "/v1/generate/reply?async_mode=false", data=reply_payload,
+                         headers=JSON_HEADERS, name="Mixed: Parallel Support Reply"),
+        ]
+        gevent.joinall(jobs)
+        
+        # Record the combined wall time of both calls as its own entry. The
+        # client does not raise on HTTP errors, so non-2xx sub-responses fail
+        # the combined entry explicitly
+        exception = next((job.exception for job in jobs if job.exception), None)
+        if exception is None:
+            failed = next((job.value for job in jobs if not 200 <= job.value.status_code < 300), None)
+            if failed is not None:
+                exception = CatchResponseError(status_message(failed.status_code))
+        self.environment.events.request.fire(
+            request_type="PARALLEL",
+            name="Mixed: Retrieve + Reply",
+            response_time=(time.monotonic() - start) * 1000,
+            response_length=0,
+            exception=exception,
+            context={}
+        )
     
     @task(1)
     def health_check(self):
         """Health check"""
-        with self.client.get("/health", name="Health Check") as response:
+        with self.client.get("/health", catch_response=True, name="Health Check") as response:
             if response.status_code == 200:
                 response.success()
             else:
-                response.failure(f"HTTP {response.status_code}")
+                response.failure(status_message(response.status_code))
 
 
 # Event handlers for statistics
@@ -350,4 +559,12 @@ def on_test_stop(environment, **kwargs):
     print(f"95th Percentile: {stats.total.get_response_time_percentile(0.95)}ms")
     print(f"Requests/sec: {stats.total.total_rps:.2f}")
     
+    if CACHE_STATS:
+        hits = sum(seed_stats["hits"] for seed_stats in CACHE_STATS.values())
+        total = hits + sum(seed_stats["misses"] for seed_stats in CACHE_STATS.values())
+        print(f"\nCache Hit Rate (paraphrased intents): {hits / total * 100:.1f}% ({hits}/{total})")
+        for seed, seed_stats in sorted(CACHE_STATS.items()):
+            seed_total = seed_stats["hits"] + seed_stats["misses"]
+            print(f"  {seed}: {seed_stats['hits']}/{seed_total} hits")
+    
     print("\n" + "="*80 + "\n")
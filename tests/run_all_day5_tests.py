@@ -1,18 +1,32 @@
 """
 Master Test Runner for Day 5 Implementation
 
-Runs all three test suites in sequence:
-1. Embeddings Test Suite
-2. ChromaDB Test Suite  
-3. RAG Integration Test Suite
+Runs all three test suites:
+1. Embeddings Test Suite   } run concurrently (independent resources)
+2. ChromaDB Test Suite     }
+3. RAG Integration Test Suite (last, needs the API)
 
 Provides comprehensive validation of Day 5 RAG implementation.
+
+Suites run in this process by default so they share one embedding model;
+--isolated runs each suite as its own subprocess instead.
+
+Usage:
+    python tests/run_all_day5_tests.py             # interactive
+    python tests/run_all_day5_tests.py --yes       # no prompts (CI)
+    python tests/run_all_day5_tests.py --no-rag    # skip RAG Integration
+    python tests/run_all_day5_tests.py --isolated  # one subprocess per suite
 """
 
 import sys
+import argparse
+import importlib
 from pathlib import Path
 import subprocess
+import threading
 import time
+import urllib.request
+from typing import IO, NamedTuple, Optional
 
 # Color codes for terminal output
 GREEN = '\033[92m'
@@ -25,6 +39,9 @@ RESET = '\033[0m'
 BOLD = '\033[1m'
 
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_API_URL = "http://localhost:8000"
 
 
 def print_banner(title: str, color: str = CYAN):
@@ -34,40 +51,121 @@ def print_banner(title: str, color: str = CYAN):
     print(f"{BOLD}{color}{'='*80}{RESET}\n")
 
 
-def run_test_suite(suite_name: str, script_path: Path) -> bool:
-    """Run a test suite script and return success status"""
+class RunningSuite(NamedTuple):
+    """A launched test suite subprocess and the thread teeing its output"""
+    name: str
+    proc: subprocess.Popen
+    tee: threading.Thread
+
+
+def _tee_output(stream: IO[bytes], prefix: bytes):
+    """Copy a suite's output to our stdout line by line"""
+    for line in stream:
+        sys.stdout.buffer.write(prefix + line)
+        sys.stdout.buffer.flush()
+    stream.close()
+
+
+def launch_test_suite(suite_name: str, script_path: Path, label: str = "") -> Optional[RunningSuite]:
+    """
+    Start a test suite script without waiting for it
+    
+    Output is streamed line by line as the suite runs. Pass a label when
+    running suites concurrently so their interleaved lines stay attributable.
+    """
     print_banner(f"Running: {suite_name}", CYAN)
     
     if not script_path.exists():
         print(f"{RED}✗ Test script not found: {script_path}{RESET}")
-        return False
+        return None
     
     print(f"{BLUE}Executing: python {script_path.relative_to(PROJECT_ROOT)}{RESET}\n")
+    sys.stdout.flush()
     
     try:
         # Run the test script
-        result = subprocess.run(
+        proc = subprocess.Popen(
             [sys.executable, str(script_path)],
             cwd=PROJECT_ROOT,
-            capture_output=False,  # Show output in real-time
-            text=True
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
         )
-        
-        success = result.returncode == 0
-        
-        if success:
-            print(f"\n{GREEN}{BOLD}✓ {suite_name} COMPLETED SUCCESSFULLY{RESET}")
-        else:
-            print(f"\n{YELLOW}{BOLD}⚠ {suite_name} COMPLETED WITH ISSUES{RESET}")
-        
-        return success
-        
     except Exception as e:
         print(f"{RED}✗ Error running {suite_name}: {e}{RESET}")
+        return None
+    
+    # Tee output in real time
+    prefix = f"{BLUE}[{label}]{RESET} ".encode() if label else b""
+    tee = threading.Thread(target=_tee_output, args=(proc.stdout, prefix), daemon=True)
+    tee.start()
+    return RunningSuite(suite_name, proc, tee)
+
+
+def wait_test_suite(suite: Optional[RunningSuite]) -> bool:
+    """Wait for a launched suite to exit and report its status"""
+    if suite is None:
         return False
+    
+    success = suite.proc.wait() == 0
+    suite.tee.join()
+    
+    if success:
+        print(f"\n{GREEN}{BOLD}✓ {suite.name} COMPLETED SUCCESSFULLY{RESET}")
+    else:
+        print(f"\n{YELLOW}{BOLD}⚠ {suite.name} COMPLETED WITH ISSUES{RESET}")
+    
+    return success
+
+
+def run_test_suite(suite_name: str, script_path: Path) -> bool:
+    """Run a test suite script to completion and return success status"""
+    return wait_test_suite(launch_test_suite(suite_name, script_path))
 
 
-def main():
+def run_suite_in_process(suite_name: str, module_name: str) -> bool:
+    """Import a test suite module and run its run_all_tests() in this process"""
+    print_banner(f"Running: {suite_name}", CYAN)
+    print(f"{BLUE}Running in-process: {module_name}.run_all_tests(){RESET}\n")
+    
+    try:
+        module = importlib.import_module(module_name)
+        success = bool(module.run_all_tests())
+    except (Exception, SystemExit) as e:
+        print(f"{RED}✗ Error running {suite_name}: {e}{RESET}")
+        return False
+    
+    if success:
+        print(f"\n{GREEN}{BOLD}✓ {suite_name} COMPLETED SUCCESSFULLY{RESET}")
+    else:
+        print(f"\n{YELLOW}{BOLD}⚠ {suite_name} COMPLETED WITH ISSUES{RESET}")
+    
+    return success
+
+
+def api_is_running(api_url: str) -> bool:
+    """Probe the API's /v1/stats endpoint"""
+    try:
+        with urllib.request.urlopen(f"{api_url}/v1/stats", timeout=2) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Run all Day 5 test suites")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="skip all prompts and assume the API is running")
+    parser.add_argument("--no-rag", action="store_true",
+                        help="skip the RAG Integration suite")
+    parser.add_argument("--isolated", action="store_true",
+                        help="run each suite in its own subprocess (Embeddings and ChromaDB in parallel)")
+    parser.add_argument("--api-url", default=DEFAULT_API_URL,
+                        help=f"API base URL to probe (default: {DEFAULT_API_URL})")
+    return parser.parse_args(argv)
+
+
+def main(args):
     """Run all test suites"""
     print_banner("DAY 5 IMPLEMENTATION - COMPREHENSIVE TEST SUITE", MAGENTA)
     
@@ -77,39 +175,62 @@ def main():
     print(f"  3. {CYAN}RAG Integration{RESET} - both agents with retrieval-augmented generation")
     print()
     
-    input(f"{YELLOW}Press Enter to start tests...{RESET}")
+    if not args.yes:
+        input(f"{YELLOW}Press Enter to start tests...{RESET}")
     
     # Track results
     results = {}
     start_time = time.time()
     
-    # Test Suite 1: Embeddings
-    results["Embeddings"] = run_test_suite(
-        "Embeddings Test Suite",
-        PROJECT_ROOT / "tests" / "test_embeddings.py"
-    )
-    time.sleep(2)
-    
-    # Test Suite 2: ChromaDB
-    results["ChromaDB"] = run_test_suite(
-        "ChromaDB Test Suite",
-        PROJECT_ROOT / "tests" / "test_chromadb.py"
-    )
-    time.sleep(2)
+    if args.isolated:
+        # Test Suites 1 & 2: Embeddings and ChromaDB are independent, run them together
+        embeddings_suite = launch_test_suite(
+            "Embeddings Test Suite",
+            PROJECT_ROOT / "tests" / "test_embeddings.py",
+            label="Embeddings"
+        )
+        chromadb_suite = launch_test_suite(
+            "ChromaDB Test Suite",
+            PROJECT_ROOT / "tests" / "test_chromadb.py",
+            label="ChromaDB"
+        )
+        results["Embeddings"] = wait_test_suite(embeddings_suite)
+        results["ChromaDB"] = wait_test_suite(chromadb_suite)
+    else:
+        # Load the embedding model once; both suites reuse the cached instance
+        try:
+            from backend.vector_store import get_embedding_function
+            get_embedding_function()
+        except Exception as e:
+            print(f"{YELLOW}⚠ Could not preload embedding model: {e}{RESET}")
+        
+        results["Embeddings"] = run_suite_in_process("Embeddings Test Suite", "tests.test_embeddings")
+        results["ChromaDB"] = run_suite_in_process("ChromaDB Test Suite", "tests.test_chromadb")
     
     # Test Suite 3: RAG Integration
-    print(f"\n{YELLOW}{BOLD}NOTE: RAG Integration tests require the API to be running{RESET}")
-    print(f"{YELLOW}Make sure you have started: uvicorn backend.main:app --reload{RESET}")
-    
-    proceed = input(f"\n{YELLOW}Is the API running? (y/n): {RESET}").strip().lower()
+    if args.no_rag:
+        proceed = False
+        reason = "--no-rag"
+    elif args.yes:
+        proceed = True
+    else:
+        proceed = api_is_running(args.api_url)
+        reason = f"API not reachable at {args.api_url}"
+        if not proceed:
+            print(f"\n{YELLOW}{BOLD}NOTE: RAG Integration tests require the API to be running{RESET}")
+            print(f"{YELLOW}Make sure you have started: uvicorn backend.main:app --reload{RESET}")
     
-    if proceed == 'y':
+    if proceed and args.isolated:
         results["RAG Integration"] = run_test_suite(
             "RAG Integration Test Suite",
             PROJECT_ROOT / "tests" / "test_rag_integration.py"
         )
+    elif proceed:
+        results["RAG Integration"] = run_suite_in_process(
+            "RAG Integration Test Suite", "tests.test_rag_integration"
+        )
     else:
-        print(f"\n{YELLOW}⚠ Skipping RAG Integration tests (API not running){RESET}")
+        print(f"\n{YELLOW}⚠ Skipping RAG Integration tests ({reason}){RESET}")
         results["RAG Integration"] = None
     
     # Calculate total time
@@ -180,7 +301,7 @@ def main():
 
 if __name__ == "__main__":
     try:
-        exit_code = main()
+        exit_code = main(parse_args())
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print(f"\n\n{YELLOW}Tests interrupted by user{RESET}")
@@ -7,11 +7,28 @@ Tests query expansion, personalization, and hybrid retrieval for:
 Production-level testing with comprehensive validation
 """
 
+import io
+import os
+import re
 import sys
+import json
+import asyncio
+import hashlib
+import sqlite3
+import argparse
+import tempfile
+import functools
+import contextvars
+from collections import deque
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
+import httpx
+import numpy as np
 import requests
-from typing import Dict, Any, List
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -27,31 +44,155 @@ MAGENTA = '\033[95m'
 RESET = '\033[0m'
 BOLD = '\033[1m'
 
+# Banner rules, built once
+BAR = '=' * 80
+TEST_HEADER_RULE = f"\n{BLUE}{'─' * 80}{RESET}\n"
+
+# Status line prefixes/suffix, built once
+OK_PREFIX = f"{GREEN}✓ "
+FAIL_PREFIX = f"{RED}✗ "
+WARN_PREFIX = f"{YELLOW}⚠ "
+LINE_END = f"{RESET}\n"
+
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive connection pool shared by every test
+session = requests.Session()
+# Throttled (429) requests are retried with backoff instead of pacing the tests
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_MAX_DELAY = 30  # seconds
+
+session.mount('http://', requests.adapters.HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=RATE_LIMIT_RETRIES,
+        read=0,  # Never resend a generation that timed out
+        backoff_factor=0.3,  # Dropped keep-alive connections
+        status_forcelist=(429,),
+        allowed_methods=None,  # 429s are safe to retry for POSTs too
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+))
+
+# Ready /v1/stats responses are reused across runs for a short while
+STATUS_CACHE_PATH = Path(tempfile.gettempdir()) / "day6_health.json"
+STATUS_CACHE_TTL = 30  # seconds
+
+# Baseline (Day 6 disabled) responses recorded by earlier runs; only reused
+# with --reuse-baseline, since they are not tied to the current server or model
+BASELINE_CACHE_PATH = PROJECT_ROOT / "test_day6_baseline.sqlite"
+
+# Test 3.1 request bodies, serialized once so encoding stays out of the timed window
+JSON_HEADERS = {'Content-Type': 'application/json'}
+PAYLOAD_NO_DAY6 = json.dumps({
+    "content_type": "support_reply",
+    "topic": "order inquiry",
+    "tone": "friendly",
+    "enable_expansion": False
+}, sort_keys=True).encode()
+PAYLOAD_DAY6 = json.dumps({
+    "content_type": "support_reply",
+    "topic": "order inquiry",
+    "tone": "friendly",
+    "enable_expansion": True,
+    "personalization_context": {"customer_name": "John"}
+}, sort_keys=True).encode()
+PAYLOAD_WARMUP = json.dumps({
+    "content_type": "support_reply",
+    "topic": "warmup",
+    "tone": "friendly"
+}, sort_keys=True).encode()
+
+# The reply agent only reads the last 10 turns of conversation_history, so no
+# more than that is kept or sent
+MAX_HISTORY_TURNS = 10
+
+# Test cases within a test are sent concurrently; cap how many hit the backend at once
+MAX_CONCURRENT_REQUESTS = 4
+async_client = httpx.AsyncClient(
+    base_url=BASE_URL,
+    timeout=120,
+    limits=httpx.Limits(max_connections=8)
+)
+
+
+def log_ok(message: str, indent: str = ""):
+    """Write a green ✓ status line"""
+    sys.stdout.write(indent + OK_PREFIX + message + LINE_END)
+
+
+def log_fail(message: str, indent: str = ""):
+    """Write a red ✗ status line"""
+    sys.stdout.write(indent + FAIL_PREFIX + message + LINE_END)
+
+
+def log_warn(message: str, indent: str = ""):
+    """Write a yellow ⚠ status line"""
+    sys.stdout.write(indent + WARN_PREFIX + message + LINE_END)
+
 
 def print_banner(text: str, color: str = CYAN):
     """Print formatted banner"""
-    print(f"\n{BOLD}{color}{'='*80}{RESET}")
-    print(f"{BOLD}{color}{text}{RESET}")
-    print(f"{BOLD}{color}{'='*80}{RESET}\n")
+    print(f"\n{BOLD}{color}{BAR}{RESET}\n{BOLD}{color}{text}{RESET}\n{BOLD}{color}{BAR}{RESET}\n")
 
 
 def print_test_header(test_num: int, test_name: str):
     """Print test header"""
-    print(f"\n{BLUE}{'─'*80}{RESET}")
-    print(f"{BLUE}{BOLD}Test {test_num}: {test_name}{RESET}")
-    print(f"{BLUE}{'─'*80}{RESET}\n")
+    print(f"{TEST_HEADER_RULE}{BLUE}{BOLD}Test {test_num}: {test_name}{RESET}{TEST_HEADER_RULE}")
+
+
+def _read_status_cache(base_url: str):
+    """Return stats cached for this server within the last STATUS_CACHE_TTL seconds"""
+    try:
+        cached = json.loads(STATUS_CACHE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if cached.get('base_url') != base_url or time.time() - cached.get('timestamp', 0) > STATUS_CACHE_TTL:
+        return None
+    return cached.get('stats')
+
+
+def _write_status_cache(base_url: str, stats: Dict[str, Any]):
+    """Record stats for the next run"""
+    try:
+        STATUS_CACHE_PATH.write_text(
+            json.dumps({'base_url': base_url, 'timestamp': time.time(), 'stats': stats}),
+            encoding='utf-8'
+        )
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _fetch_stats(base_url: str) -> Dict[str, Any]:
+    """GET /v1/stats once per server (keyed by base URL) and reuse the result"""
+    cached = _read_status_cache(base_url)
+    if cached is not None:
+        return cached
+    
+    response = session.get(f"{base_url}/v1/stats", timeout=10)
+    response.raise_for_status()
+    stats = response.json()
+    
+    # Only a ready server is cached, so a restart to load Day 6 is picked up at once
+    if stats.get('system', {}).get('day6_features_available'):
+        _write_status_cache(base_url, stats)
+    return stats
 
 
 def check_system_status():
     """Verify Day 6 features are available"""
     print_banner("SYSTEM STATUS CHECK")
     
+    # FORCE_REFRESH=1 re-queries the server instead of reusing a cached status
+    if os.getenv("FORCE_REFRESH") == "1":
+        _fetch_stats.cache_clear()
+        STATUS_CACHE_PATH.unlink(missing_ok=True)
+    
     try:
-        response = requests.get(f"{BASE_URL}/v1/stats", timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = _fetch_stats(BASE_URL)
         
         system = data.get('system', {})
         day6_available = system.get('day6_features_available', False)
@@ -76,11 +217,171 @@ def check_system_status():
         return False
 
 
+@functools.lru_cache(maxsize=128)
+def _cached_baseline_post(payload_json: bytes) -> Tuple[float, Dict[str, Any]]:
+    """
+    POST a content request once and reuse its (latency, response) afterwards
+    
+    Results are kept in memory and in a SQLite file keyed by the payload hash,
+    so later runs skip the LLM call entirely.
+    """
+    key = hashlib.sha256(payload_json).hexdigest()
+    with closing(sqlite3.connect(BASELINE_CACHE_PATH)) as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS baseline (key TEXT PRIMARY KEY, latency REAL, response TEXT)"
+        )
+        row = conn.execute("SELECT latency, response FROM baseline WHERE key = ?", (key,)).fetchone()
+        if row:
+            return row[0], json.loads(row[1])
+        
+        start = time.perf_counter_ns()
+        response = session.post(
+            f"{BASE_URL}/v1/generate/content",
+            data=payload_json,
+            headers=JSON_HEADERS,
+            timeout=120
+        )
+        latency = (time.perf_counter_ns() - start) / 1e9
+        response.raise_for_status()
+        data = response.json()
+        
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO baseline VALUES (?, ?, ?)",
+                (key, latency, json.dumps(data))
+            )
+        return latency, data
+
+
+def _retry_delay(response, attempt: int) -> float:
+    """Seconds to wait before retrying a 429: Retry-After if sent, else exponential"""
+    try:
+        return min(float(response.headers["retry-after"]), RATE_LIMIT_MAX_DELAY)
+    except (KeyError, ValueError):
+        return min(2 ** attempt, RATE_LIMIT_MAX_DELAY)
+
+
+class CachedResponse:
+    """Stand-in for a 200 response served from the semantic cache"""
+    
+    status_code = 200
+    is_success = True
+    
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+    
+    def json(self) -> Dict[str, Any]:
+        return self._data
+
+
+class SemanticResponseCache:
+    """
+    In-memory response cache matching requests by meaning
+    
+    A request hits when every field except its free text (topic or message)
+    is identical to a cached one and the texts' embeddings have cosine
+    similarity >= threshold. Lives for one test run.
+    """
+    
+    def __init__(self, threshold: float = 0.95):
+        from backend.vector_store import get_embedding_function
+        self.threshold = threshold
+        self._embed = get_embedding_function()
+        # (path, other fields) -> (unit text vectors, responses)
+        self._entries: Dict[str, Tuple[List[np.ndarray], List[Dict[str, Any]]]] = {}
+        self.hits = 0
+    
+    @staticmethod
+    def _split(path: str, payload: Dict[str, Any]) -> Tuple[str, str]:
+        text_field = 'topic' if 'topic' in payload else 'message'
+        rest = {key: value for key, value in payload.items() if key != text_field}
+        return f"{path}|{json.dumps(rest, sort_keys=True)}", str(payload.get(text_field, ''))
+    
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.asarray(self._embed([text])[0], dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+    
+    def get(self, path: str, payload: Dict[str, Any]) -> Optional[CachedResponse]:
+        """Return the cached response for a near-duplicate request, if any"""
+        key, text = self._split(path, payload)
+        if key not in self._entries:
+            return None
+        vectors, responses = self._entries[key]
+        similarities = np.stack(vectors) @ self._vector(text)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        self.hits += 1
+        return CachedResponse(responses[best])
+    
+    def put(self, path: str, payload: Dict[str, Any], data: Dict[str, Any]):
+        """Remember a successful response"""
+        key, text = self._split(path, payload)
+        vectors, responses = self._entries.setdefault(key, ([], []))
+        vectors.append(self._vector(text))
+        responses.append(data)
+
+
+# Set by main() with --semantic-cache
+semantic_cache: Optional[SemanticResponseCache] = None
+
+
+async def post_cases(
+    path: str,
+    payloads: List[Dict[str, Any]],
+    timeout: float = 120,
+    min_length: int = 0
+) -> List[Any]:
+    """
+    POST every payload concurrently
+    
+    Responses are streamed: the body is only downloaded for successful
+    responses whose Content-Length reaches min_length (bytes), so failed or
+    obviously too-short cases are decided from the headers alone.
+    
+    Throttled (429) requests are retried up to RATE_LIMIT_RETRIES times,
+    honouring Retry-After. With --semantic-cache, near-duplicate requests are answered from
+    semantic_cache with a latency of 0.
+    
+    Returns one (response, latency) tuple per payload, in payload order, or
+    the exception raised for that request.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def post(payload: Dict[str, Any]):
+        if semantic_cache is not None:
+            cached = semantic_cache.get(path, payload)
+            if cached is not None:
+                return cached, 0.0
+        
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            async with semaphore:
+                start = time.perf_counter_ns()
+                async with async_client.stream("POST", path, json=payload, timeout=timeout) as response:
+                    if response.is_success:
+                        content_length = int(response.headers.get("content-length", min_length))
+                        if content_length < min_length:
+                            raise ValueError(f"response too short ({content_length} bytes)")
+                        await response.aread()
+                latency = (time.perf_counter_ns() - start) / 1e9
+            
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                break
+            # Back off outside the semaphore so other cases keep going
+            await asyncio.sleep(_retry_delay(response, attempt))
+        
+        if semantic_cache is not None and response.status_code == 200:
+            semantic_cache.put(path, payload, response.json())
+        return response, latency
+    
+    return await asyncio.gather(*(post(payload) for payload in payloads), return_exceptions=True)
+
+
 # ============================================================================
 # TEST SUITE 1: CONTENT GENERATION AGENT WITH DAY 6 FEATURES
 # ============================================================================
 
-def test_content_agent_query_expansion():
+async def test_content_agent_query_expansion():
     """Test 1.1: Content Generation Agent with Query Expansion"""
     print_test_header("1.1", "Content Agent - Query Expansion")
     
@@ -108,50 +409,52 @@ def test_content_agent_query_expansion():
         }
     ]
     
+    outcomes = await post_cases("/v1/generate/content", [
+        {
+            "content_type": test['content_type'],
+            "topic": test['topic'],
+            "tone": test['tone'],
+            "enable_expansion": test['enable_expansion']
+        }
+        for test in test_cases
+    ], min_length=100)
+    
     results = []
     
-    for i, test in enumerate(test_cases, 1):
-        print(f"\n{CYAN}Test Case {i}: {test['description']}{RESET}")
-        print(f"Topic: {test['topic']}")
-        print(f"Content Type: {test['content_type']}")
-        
-        try:
-            start = time.time()
-            response = requests.post(
-                f"{BASE_URL}/v1/generate/content",
-                json={
-                    "content_type": test['content_type'],
-                    "topic": test['topic'],
-                    "tone": test['tone'],
-                    "enable_expansion": test['enable_expansion']
-                },
-                timeout=120
-            )
-            latency = time.time() - start
+    for i, (test, outcome) in enumerate(zip(test_cases, outcomes), 1):
+        with buffered_case():
+            print(f"\n{CYAN}Test Case {i}: {test['description']}{RESET}")
+            print(f"Topic: {test['topic']}")
+            print(f"Content Type: {test['content_type']}")
             
-            if response.status_code == 200:
-                data = response.json()
-                body_len = len(data['body'])
-                
-                print(f"{GREEN}✓ Generated successfully ({latency:.2f}s){RESET}")
-                print(f"  Headline: {data['headline'][:60]}...")
-                print(f"  Body length: {body_len} chars")
-                print(f"  LLM latency: {data['latency_s']:.2f}s")
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                response, latency = outcome
                 
-                # Validation
-                if body_len > 100 and data['headline']:
-                    print(f"  {GREEN}✓ Quality check passed{RESET}")
-                    results.append(True)
+                if response.status_code == 200:
+                    data = response.json()
+                    body_len = len(data['body'])
+                    
+                    log_ok(f"Generated successfully ({latency:.2f}s)")
+                    print(f"  Headline: {data['headline'][:60]}...")
+                    print(f"  Body length: {body_len} chars")
+                    print(f"  LLM latency: {data['latency_s']:.2f}s")
+                    
+                    # Validation
+                    if body_len > 100 and data['headline']:
+                        log_ok("Quality check passed", indent="  ")
+                        results.append(True)
+                    else:
+                        log_fail("Quality check failed", indent="  ")
+                        results.append(False)
                 else:
-                    print(f"  {RED}✗ Quality check failed{RESET}")
+                    log_fail(f"Request failed: {response.status_code}")
                     results.append(False)
-            else:
-                print(f"{RED}✗ Request failed: {response.status_code}{RESET}")
+                    
+            except Exception as e:
+                log_fail(f"Error: {e}")
                 results.append(False)
-                
-        except Exception as e:
-            print(f"{RED}✗ Error: {e}{RESET}")
-            results.append(False)
     
     passed = sum(results)
     total = len(results)
@@ -165,7 +468,7 @@ def test_content_agent_query_expansion():
         return False
 
 
-def test_content_agent_personalization():
+async def test_content_agent_personalization():
     """Test 1.2: Content Generation Agent with Personalization"""
     print_test_header("1.2", "Content Agent - Personalization")
     
@@ -193,56 +496,64 @@ def test_content_agent_personalization():
         }
     ]
     
+    outcomes = await post_cases("/v1/generate/content", [
+        {
+            "content_type": test['content_type'],
+            "topic": test['topic'],
+            "tone": test['tone'],
+            "personalization_context": test['personalization_context']
+        }
+        for test in test_cases
+    ], min_length=100)
+    
     results = []
     
-    for i, test in enumerate(test_cases, 1):
-        print(f"\n{CYAN}Test Case {i}: {test['description']}{RESET}")
-        print(f"Topic: {test['topic']}")
-        print(f"Personalization: {list(test['personalization_context'].keys())}")
-        
-        try:
-            start = time.time()
-            response = requests.post(
-                f"{BASE_URL}/v1/generate/content",
-                json={
-                    "content_type": test['content_type'],
-                    "topic": test['topic'],
-                    "tone": test['tone'],
-                    "personalization_context": test['personalization_context']
-                },
-                timeout=120
-            )
-            latency = time.time() - start
+    for i, (test, outcome) in enumerate(zip(test_cases, outcomes), 1):
+        with buffered_case():
+            print(f"\n{CYAN}Test Case {i}: {test['description']}{RESET}")
+            print(f"Topic: {test['topic']}")
+            print(f"Personalization: {list(test['personalization_context'].keys())}")
             
-            if response.status_code == 200:
-                data = response.json()
-                body = data['body']
-                
-                print(f"{GREEN}✓ Generated successfully ({latency:.2f}s){RESET}")
-                print(f"  Body: {body[:150]}...")
-                
-                # Check for personalization tokens in output
-                tokens_found = []
-                for key, value in test['personalization_context'].items():
-                    if str(value) in body or str(value).split()[0] in body:
-                        tokens_found.append(key)
-                
-                print(f"  Tokens found: {tokens_found if tokens_found else 'None (using fallbacks)'}")
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                response, latency = outcome
                 
-                # Pass if content generated (personalization is optional, may use fallbacks)
-                if len(body) > 100:
-                    print(f"  {GREEN}✓ Content quality good{RESET}")
-                    results.append(True)
+                if response.status_code == 200:
+                    data = response.json()
+                    body = data['body']
+                    
+                    log_ok(f"Generated successfully ({latency:.2f}s)")
+                    print(f"  Body: {body[:150]}...")
+                    
+                    # Check for personalization tokens in output: each value (or its
+                    # first word) is one alternative of a single regex scan
+                    needle_keys = {}
+                    for key, value in test['personalization_context'].items():
+                        needle_keys.setdefault(str(value), key)
+                        needle_keys.setdefault(str(value).split()[0], key)
+                    pattern = re.compile('|'.join(
+                        re.escape(needle) for needle in sorted(needle_keys, key=len, reverse=True)
+                    ))
+                    found_keys = {needle_keys[match] for match in pattern.findall(body)}
+                    tokens_found = [key for key in test['personalization_context'] if key in found_keys]
+                    
+                    print(f"  Tokens found: {tokens_found if tokens_found else 'None (using fallbacks)'}")
+                    
+                    # Pass if content generated (personalization is optional, may use fallbacks)
+                    if len(body) > 100:
+                        log_ok("Content quality good", indent="  ")
+                        results.append(True)
+                    else:
+                        log_fail("Content too short", indent="  ")
+                        results.append(False)
                 else:
-                    print(f"  {RED}✗ Content too short{RESET}")
+                    log_fail(f"Request failed: {response.status_code}")
                     results.append(False)
-            else:
-                print(f"{RED}✗ Request failed: {response.status_code}{RESET}")
+                    
+            except Exception as e:
+                log_fail(f"Error: {e}")
                 results.append(False)
-                
-        except Exception as e:
-            print(f"{RED}✗ Error: {e}{RESET}")
-            results.append(False)
     
     passed = sum(results)
     total = len(results)
@@ -256,7 +567,7 @@ def test_content_agent_personalization():
         return False
 
 
-def test_content_agent_all_types():
+async def test_content_agent_all_types():
     """Test 1.3: Content Generation Agent - All 6 Content Types with Day 6"""
     print_test_header("1.3", "Content Agent - All 6 Content Types")
     
@@ -269,35 +580,39 @@ def test_content_agent_all_types():
         ("support_reply", "refund request processing", "empathetic")
     ]
     
+    outcomes = await post_cases("/v1/generate/content", [
+        {
+            "content_type": content_type,
+            "topic": topic,
+            "tone": tone,
+            "enable_expansion": True  # Day 6 enabled
+        }
+        for content_type, topic, tone in test_cases
+    ])
+    
     results = []
     
-    for i, (content_type, topic, tone) in enumerate(test_cases, 1):
-        print(f"\n{CYAN}Test {i}/6: {content_type}{RESET}")
-        print(f"Topic: {topic}")
-        
-        try:
-            response = requests.post(
-                f"{BASE_URL}/v1/generate/content",
-                json={
-                    "content_type": content_type,
-                    "topic": topic,
-                    "tone": tone,
-                    "enable_expansion": True  # Day 6 enabled
-                },
-                timeout=120
-            )
+    for i, ((content_type, topic, tone), outcome) in enumerate(zip(test_cases, outcomes), 1):
+        with buffered_case():
+            print(f"\n{CYAN}Test {i}/6: {content_type}{RESET}")
+            print(f"Topic: {topic}")
             
-            if response.status_code == 200:
-                data = response.json()
-                print(f"{GREEN}✓ Generated ({len(data['body'])} chars){RESET}")
-                results.append(True)
-            else:
-                print(f"{RED}✗ Failed: {response.status_code}{RESET}")
-                results.append(False)
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                response, _ = outcome
                 
-        except Exception as e:
-            print(f"{RED}✗ Error: {e}{RESET}")
-            results.append(False)
+                if response.status_code == 200:
+                    data = response.json()
+                    log_ok(f"Generated ({len(data['body'])} chars)")
+                    results.append(True)
+                else:
+                    log_fail(f"Failed: {response.status_code}")
+                    results.append(False)
+                    
+            except Exception as e:
+                log_fail(f"Error: {e}")
+                results.append(False)
     
     passed = sum(results)
     total = len(results)
@@ -340,42 +655,43 @@ def test_reply_agent_with_rag():
     results = []
     
     for i, test in enumerate(test_cases, 1):
-        print(f"\n{CYAN}Test Case {i}: {test['description']}{RESET}")
-        print(f"Message: {test['message']}")
-        
-        try:
-            start = time.time()
-            response = requests.post(
-                f"{BASE_URL}/v1/generate/reply?async_mode=false",
-                json={"message": test['message']},
-                timeout=120
-            )
-            latency = time.time() - start
+        with buffered_case():
+            print(f"\n{CYAN}Test Case {i}: {test['description']}{RESET}")
+            print(f"Message: {test['message']}")
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                print(f"{GREEN}✓ Reply generated ({latency:.2f}s){RESET}")
-                print(f"  Intent: {data['detected_intent']}")
-                print(f"  Reply: {data['reply'][:100]}...")
+            try:
+                start = time.perf_counter_ns()
+                response = session.post(
+                    f"{BASE_URL}/v1/generate/reply?async_mode=false",
+                    json={"message": test['message']},
+                    timeout=120
+                )
+                latency = (time.perf_counter_ns() - start) / 1e9
                 
-                # Validate intent
-                intent_correct = data['detected_intent'] == test['expected_intent']
-                reply_sufficient = len(data['reply']) > 50
-                
-                if intent_correct and reply_sufficient:
-                    print(f"  {GREEN}✓ Intent correct, reply sufficient{RESET}")
-                    results.append(True)
+                if response.status_code == 200:
+                    data = response.json()
+                    
+                    log_ok(f"Reply generated ({latency:.2f}s)")
+                    print(f"  Intent: {data['detected_intent']}")
+                    print(f"  Reply: {data['reply'][:100]}...")
+                    
+                    # Validate intent
+                    intent_correct = data['detected_intent'] == test['expected_intent']
+                    reply_sufficient = len(data['reply']) > 50
+                    
+                    if intent_correct and reply_sufficient:
+                        log_ok("Intent correct, reply sufficient", indent="  ")
+                        results.append(True)
+                    else:
+                        log_warn(f"Intent: {intent_correct}, Reply sufficient: {reply_sufficient}", indent="  ")
+                        results.append(False)
                 else:
-                    print(f"  {YELLOW}⚠ Intent: {intent_correct}, Reply sufficient: {reply_sufficient}{RESET}")
+                    log_fail(f"Request failed: {response.status_code}")
                     results.append(False)
-            else:
-                print(f"{RED}✗ Request failed: {response.status_code}{RESET}")
+                    
+            except Exception as e:
+                log_fail(f"Error: {e}")
                 results.append(False)
-                
-        except Exception as e:
-            print(f"{RED}✗ Error: {e}{RESET}")
-            results.append(False)
     
     passed = sum(results)
     total = len(results)
@@ -393,14 +709,16 @@ def test_reply_agent_multi_turn():
     """Test 2.2: Reply Agent - Multi-turn Conversation"""
     print_test_header("2.2", "Reply Agent - Multi-turn Conversation")
     
-    conversation_history = []
+    # Bounded history as parallel role/message ring buffers
+    roles = deque(maxlen=MAX_HISTORY_TURNS)
+    messages = deque(maxlen=MAX_HISTORY_TURNS)
     
     # Turn 1
     print(f"\n{CYAN}Turn 1: Initial complaint{RESET}")
     message1 = "My package is late"
     
     try:
-        response1 = requests.post(
+        response1 = session.post(
             f"{BASE_URL}/v1/generate/reply?async_mode=false",
             json={"message": message1},
             timeout=120
@@ -408,18 +726,16 @@ def test_reply_agent_multi_turn():
         
         if response1.status_code == 200:
             data1 = response1.json()
-            print(f"{GREEN}✓ Reply 1 generated{RESET}")
+            log_ok("Reply 1 generated")
             print(f"  Reply: {data1['reply'][:80]}...")
             
-            conversation_history = [
-                {"role": "customer", "message": message1},
-                {"role": "agent", "message": data1['reply']}
-            ]
+            roles.extend(("customer", "agent"))
+            messages.extend((message1, data1['reply']))
         else:
-            print(f"{RED}✗ Turn 1 failed{RESET}")
+            log_fail("Turn 1 failed")
             return False
     except Exception as e:
-        print(f"{RED}✗ Turn 1 error: {e}{RESET}")
+        log_fail(f"Turn 1 error: {e}")
         return False
     
     # Turn 2
@@ -427,30 +743,32 @@ def test_reply_agent_multi_turn():
     message2 = "My order number is ORD-98765"
     
     try:
-        response2 = requests.post(
+        response2 = session.post(
             f"{BASE_URL}/v1/generate/reply?async_mode=false",
             json={
                 "message": message2,
-                "conversation_history": conversation_history
+                "conversation_history": [
+                    {"role": role, "message": message} for role, message in zip(roles, messages)
+                ]
             },
             timeout=120
         )
         
         if response2.status_code == 200:
             data2 = response2.json()
-            print(f"{GREEN}✓ Reply 2 generated (with context){RESET}")
+            log_ok("Reply 2 generated (with context)")
             print(f"  Reply: {data2['reply'][:80]}...")
-            print(f"  {GREEN}✓ Multi-turn conversation works{RESET}")
+            log_ok("Multi-turn conversation works", indent="  ")
             return True
         else:
-            print(f"{RED}✗ Turn 2 failed{RESET}")
+            log_fail("Turn 2 failed")
             return False
     except Exception as e:
-        print(f"{RED}✗ Turn 2 error: {e}{RESET}")
+        log_fail(f"Turn 2 error: {e}")
         return False
 
 
-def test_reply_agent_intent_classification():
+async def test_reply_agent_intent_classification():
     """Test 2.3: Reply Agent - Intent Classification Accuracy"""
     print_test_header("2.3", "Reply Agent - Intent Classification")
     
@@ -463,37 +781,46 @@ def test_reply_agent_intent_classification():
         ("I want to update my email address", "request")
     ]
     
-    results = []
+    # The API has no batch classification endpoint, so classify all messages concurrently
+    outcomes = await post_cases(
+        "/v1/classify/intent",
+        [{"message": message} for message, _ in test_cases],
+        timeout=60
+    )
     
-    for i, (message, expected_intent) in enumerate(test_cases, 1):
-        print(f"\n{CYAN}Test {i}/6:{RESET} {message[:50]}...")
-        
-        try:
-            response = requests.post(
-                f"{BASE_URL}/v1/classify/intent",
-                json={"message": message},
-                timeout=60
-            )
+    # Detected intent per case (None when the request failed)
+    detected = []
+    expected = [expected_intent for _, expected_intent in test_cases]
+    
+    for i, ((message, expected_intent), outcome) in enumerate(zip(test_cases, outcomes), 1):
+        with buffered_case():
+            print(f"\n{CYAN}Test {i}/6:{RESET} {message[:50]}...")
             
-            if response.status_code == 200:
-                data = response.json()
-                detected_intent = data['intent']
-                correct = detected_intent == expected_intent
+            try:
+                if isinstance(outcome, Exception):
+                    raise outcome
+                response, _ = outcome
                 
-                status = f"{GREEN}✓" if correct else f"{RED}✗"
-                print(f"  {status} Detected: {detected_intent}, Expected: {expected_intent}{RESET}")
-                results.append(correct)
-            else:
-                print(f"  {RED}✗ Request failed{RESET}")
-                results.append(False)
-                
-        except Exception as e:
-            print(f"  {RED}✗ Error: {e}{RESET}")
-            results.append(False)
+                if response.status_code == 200:
+                    data = response.json()
+                    detected_intent = data['intent']
+                    correct = detected_intent == expected_intent
+                    
+                    status = f"{GREEN}✓" if correct else f"{RED}✗"
+                    print(f"  {status} Detected: {detected_intent}, Expected: {expected_intent}{RESET}")
+                    detected.append(detected_intent)
+                else:
+                    log_fail("Request failed", indent="  ")
+                    detected.append(None)
+                    
+            except Exception as e:
+                log_fail(f"Error: {e}", indent="  ")
+                detected.append(None)
     
-    passed = sum(results)
-    total = len(results)
-    accuracy = passed / total * 100
+    matches = np.array(detected, dtype=object) == np.array(expected, dtype=object)
+    passed = int(matches.sum())
+    total = matches.size
+    accuracy = float(matches.mean()) * 100
     
     print(f"\n{BLUE}{'─'*80}{RESET}")
     print(f"Intent Classification Accuracy: {accuracy:.1f}% ({passed}/{total})")
@@ -510,8 +837,30 @@ def test_reply_agent_intent_classification():
 # TEST SUITE 3: PERFORMANCE & QUALITY
 # ============================================================================
 
-def test_day6_performance_impact():
-    """Test 3.1: Day 6 Performance Impact"""
+def timed_post(payload: bytes) -> float:
+    """POST a pre-serialized content request and return its wall-clock latency"""
+    start = time.perf_counter_ns()
+    session.post(
+        f"{BASE_URL}/v1/generate/content",
+        data=payload,
+        headers=JSON_HEADERS,
+        timeout=120
+    )
+    return (time.perf_counter_ns() - start) / 1e9
+
+
+def test_day6_performance_impact(use_cache: bool = False, parallel: bool = False):
+    """
+    Test 3.1: Day 6 Performance Impact
+    
+    Args:
+        use_cache: Reuse the recorded baseline latency instead of calling the LLM
+                   (off by default: a recorded latency may come from another
+                   machine or model)
+        parallel: Send both requests at once (quick check, but they queue on
+                  the same LLM backend); by default they are measured one
+                  after the other for a clean delta
+    """
     print_test_header("3.1", "Day 6 Performance Impact")
     
     print("Measuring latency with/without Day 6 features...\n")
@@ -519,43 +868,36 @@ def test_day6_performance_impact():
     # Test Content Generation Agent
     print(f"{CYAN}Content Generation Agent:{RESET}")
     
+    # Untimed warmup so neither measurement pays the model's cold start
+    try:
+        timed_post(PAYLOAD_WARMUP)
+    except Exception as e:
+        log_warn(f"Warmup request failed: {e}", indent="  ")
+    
+    def baseline_latency() -> float:
+        if use_cache:
+            return _cached_baseline_post(PAYLOAD_NO_DAY6)[0]
+        return timed_post(PAYLOAD_NO_DAY6)
+    
+    # A single worker runs the two submissions in order
+    with ThreadPoolExecutor(max_workers=2 if parallel else 1) as executor:
+        future_without = executor.submit(baseline_latency)
+        future_with = executor.submit(timed_post, PAYLOAD_DAY6)
+    
     # Without Day 6
     try:
-        start = time.time()
-        response1 = requests.post(
-            f"{BASE_URL}/v1/generate/content",
-            json={
-                "content_type": "support_reply",
-                "topic": "order inquiry",
-                "tone": "friendly",
-                "enable_expansion": False
-            },
-            timeout=120
-        )
-        latency_without = time.time() - start
-        print(f"  Without Day 6: {latency_without:.2f}s")
+        latency_without = future_without.result()
+        print(f"  Without Day 6: {latency_without:.2f}s{' (cached baseline)' if use_cache else ''}")
     except Exception as e:
-        print(f"  {RED}✗ Error: {e}{RESET}")
+        log_fail(f"Error: {e}", indent="  ")
         latency_without = 0
     
     # With Day 6
     try:
-        start = time.time()
-        response2 = requests.post(
-            f"{BASE_URL}/v1/generate/content",
-            json={
-                "content_type": "support_reply",
-                "topic": "order inquiry",
-                "tone": "friendly",
-                "enable_expansion": True,
-                "personalization_context": {"customer_name": "John"}
-            },
-            timeout=120
-        )
-        latency_with = time.time() - start
+        latency_with = future_with.result()
         print(f"  With Day 6: {latency_with:.2f}s")
     except Exception as e:
-        print(f"  {RED}✗ Error: {e}{RESET}")
+        log_fail(f"Error: {e}", indent="  ")
         latency_with = 0
     
     if latency_without > 0 and latency_with > 0:
@@ -563,13 +905,13 @@ def test_day6_performance_impact():
         print(f"  Day 6 overhead: {overhead:+.2f}s")
         
         if overhead < 2.0:  # Less than 2s overhead acceptable
-            print(f"  {GREEN}✓ Performance impact acceptable{RESET}")
+            log_ok("Performance impact acceptable", indent="  ")
             return True
         else:
-            print(f"  {YELLOW}⚠ Performance overhead high{RESET}")
+            log_warn("Performance overhead high", indent="  ")
             return False
     else:
-        print(f"  {RED}✗ Could not measure performance{RESET}")
+        log_fail("Could not measure performance", indent="  ")
         return False
 
 
@@ -577,8 +919,93 @@ def test_day6_performance_impact():
 # MAIN TEST RUNNER
 # ============================================================================
 
-def main():
+# Output buffer of the suite running in the current task/thread (None = print directly)
+_suite_output: contextvars.ContextVar = contextvars.ContextVar('suite_output', default=None)
+
+
+class _SuiteStdout:
+    """sys.stdout proxy routing writes to the current suite's buffer, if any"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text: str) -> int:
+        return (_suite_output.get() or self._stream).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+async def run_buffered(suite):
+    """Await a suite with its output held back, then print the output in one piece"""
+    buffer = io.StringIO()
+    token = _suite_output.set(buffer)
+    try:
+        return await suite
+    finally:
+        _suite_output.reset(token)
+        sys.stdout.write(buffer.getvalue())
+
+
+@contextmanager
+def buffered_case():
+    """Collect one test case's lines and write them with a single call"""
+    buffer = io.StringIO()
+    token = _suite_output.set(buffer)
+    try:
+        yield
+    finally:
+        _suite_output.reset(token)
+        sys.stdout.write(buffer.getvalue())
+
+
+async def run_content_suites() -> List[bool]:
+    """Test Suite 1: the content tests share no state, so they run together"""
+    print_banner("TEST SUITE 1: CONTENT GENERATION AGENT", CYAN)
+    return await asyncio.gather(
+        run_buffered(test_content_agent_query_expansion()),
+        run_buffered(test_content_agent_personalization()),
+        run_buffered(test_content_agent_all_types())
+    )
+
+
+async def run_reply_suites() -> List[bool]:
+    """Test Suite 2: each reply test keeps its own state (2.2 stays sequential inside)"""
+    print_banner("TEST SUITE 2: CUSTOMER SUPPORT REPLY AGENT", CYAN)
+    return await asyncio.gather(
+        run_buffered(asyncio.to_thread(test_reply_agent_with_rag)),
+        run_buffered(asyncio.to_thread(test_reply_agent_multi_turn)),
+        run_buffered(test_reply_agent_intent_classification())
+    )
+
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Day 6 production tests for both agents")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="start without the 'Press Enter' prompt (implied when stdin is not a TTY)")
+    parser.add_argument("--reuse-baseline", action="store_true",
+                        help="reuse the Day 6 baseline recorded by an earlier run instead of measuring it live")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="answer near-duplicate test requests from an in-memory embedding cache")
+    parser.add_argument("--parallel", action="store_true",
+                        help="time the two performance requests concurrently (faster, skews the delta)")
+    return parser.parse_args(argv)
+
+
+async def main(args):
+    """Run all Day 6 production tests with buffered (per case / per test) output"""
+    stdout = sys.stdout
+    sys.stdout = _SuiteStdout(stdout)
+    try:
+        await run_all_tests(args)
+    finally:
+        sys.stdout = stdout
+
+
+async def run_all_tests(args):
     """Run all Day 6 production tests for both agents"""
+    global semantic_cache
     print_banner("DAY 6 PRODUCTION TEST SUITE - BOTH AGENTS", MAGENTA)
     
     print(f"{BOLD}Testing:{RESET}")
@@ -592,36 +1019,41 @@ def main():
         print(f"{RED}❌ ABORT: System not ready for Day 6 testing{RESET}\n")
         return
     
-    input(f"{YELLOW}Press Enter to start tests...{RESET}\n")
+    if not args.yes and sys.stdin.isatty():
+        input(f"{YELLOW}Press Enter to start tests...{RESET}\n")
+    
+    if args.semantic_cache:
+        semantic_cache = SemanticResponseCache()
     
     # Track results
     results = {}
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
-    # Test Suite 1: Content Generation Agent
-    print_banner("TEST SUITE 1: CONTENT GENERATION AGENT", CYAN)
-    results["1.1 Content Agent - Query Expansion"] = test_content_agent_query_expansion()
-    time.sleep(2)
-    results["1.2 Content Agent - Personalization"] = test_content_agent_personalization()
-    time.sleep(2)
-    results["1.3 Content Agent - All Types"] = test_content_agent_all_types()
-    time.sleep(2)
-    
-    # Test Suite 2: Customer Support Reply Agent
-    print_banner("TEST SUITE 2: CUSTOMER SUPPORT REPLY AGENT", CYAN)
-    results["2.1 Reply Agent - RAG Enhanced"] = test_reply_agent_with_rag()
-    time.sleep(2)
-    results["2.2 Reply Agent - Multi-turn"] = test_reply_agent_multi_turn()
-    time.sleep(2)
-    results["2.3 Reply Agent - Intent Classification"] = test_reply_agent_intent_classification()
-    time.sleep(2)
-    
-    # Test Suite 3: Performance
+    # Test Suites 1 & 2: content and reply agents hit disjoint endpoints, run them
+    # together; each suite's output is buffered and printed when it finishes
+    content_results, reply_results = await asyncio.gather(
+        run_buffered(run_content_suites()),
+        run_buffered(run_reply_suites())
+    )
+    
+    results["1.1 Content Agent - Query Expansion"] = content_results[0]
+    results["1.2 Content Agent - Personalization"] = content_results[1]
+    results["1.3 Content Agent - All Types"] = content_results[2]
+    results["2.1 Reply Agent - RAG Enhanced"] = reply_results[0]
+    results["2.2 Reply Agent - Multi-turn"] = reply_results[1]
+    results["2.3 Reply Agent - Intent Classification"] = reply_results[2]
+    
+    # Test Suite 3: Performance (alone, so latencies aren't skewed by other load)
     print_banner("TEST SUITE 3: PERFORMANCE & QUALITY", CYAN)
-    results["3.1 Day 6 Performance Impact"] = test_day6_performance_impact()
+    results["3.1 Day 6 Performance Impact"] = test_day6_performance_impact(
+        use_cache=args.reuse_baseline,
+        parallel=args.parallel
+    )
+    
+    await async_client.aclose()
     
     # Final summary
-    total_time = time.time() - start_time
+    total_time = (time.perf_counter_ns() - start_time) / 1e9
     passed = sum(1 for v in results.values() if v)
     total = len(results)
     pass_rate = passed / total * 100
@@ -635,6 +1067,8 @@ def main():
     print(f"\n{BLUE}{'─'*80}{RESET}")
     print(f"{BOLD}Total: {passed}/{total} tests passed ({pass_rate:.1f}%){RESET}")
     print(f"{BOLD}Duration: {total_time:.1f}s{RESET}")
+    if semantic_cache is not None:
+        print(f"{BOLD}Semantic cache hits: {semantic_cache.hits}{RESET}")
     
     if pass_rate >= 85:
         print(f"\n{GREEN}{BOLD}🎉 PRODUCTION READY - Both agents pass Day 6 requirements!{RESET}\n")
@@ -646,7 +1080,7 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        asyncio.run(main(parse_args()))
     except KeyboardInterrupt:
         print(f"\n\n{YELLOW}⚠️  Tests interrupted by user{RESET}\n")
     except Exception as e:
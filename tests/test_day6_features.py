@@ -45,6 +45,12 @@ from backend.rag_utils import (
 # QUERY EXPANSION TESTS
 # ==============================================================================
 
+@pytest.fixture(scope="session")
+def expander():
+    """One QueryExpander shared by the query expansion tests (its cache stays warm)"""
+    return QueryExpander(enable_caching=True)
+
+
 class TestQueryExpansion:
     """Test query expansion functionality"""
     
@@ -63,9 +69,8 @@ class TestQueryExpansion:
         assert len(expanded) >= 1  # At least original query
         assert query in expanded  # Original query included
     
-    def test_synonym_expansion(self):
+    def test_synonym_expansion(self, expander):
         """Test synonym-based expansion"""
-        expander = QueryExpander()
         query = "help with my order"
         expanded = expander.expand_query(query, max_expansions=5, include_synonyms=True)
         
@@ -75,9 +80,8 @@ class TestQueryExpansion:
         expanded_text = " ".join(expanded).lower()
         assert "help" in expanded_text or "assist" in expanded_text or "support" in expanded_text
     
-    def test_related_term_expansion(self):
+    def test_related_term_expansion(self, expander):
         """Test related term expansion"""
-        expander = QueryExpander()
         query = "cancel subscription"
         expanded = expander.expand_query(query, max_expansions=5, include_related=True)
         
@@ -98,27 +102,31 @@ class TestQueryExpansion:
         assert "please" not in keywords
         assert "my" not in keywords
     
-    def test_cache_functionality(self):
+    @pytest.mark.parametrize("query", [
+        "test query for caching",
+        "help with my order",
+        "cancel subscription",
+        "track my shipment"
+    ])
+    def test_cache_functionality(self, expander, query):
         """Test query expansion caching"""
-        expander = QueryExpander(enable_caching=True)
-        query = "test query for caching"
-        
-        # First call - cache miss
+        # First call - the query is cached afterwards
         result1 = expander.expand_query(query)
+        stats1 = expander.get_cache_stats()
         
-        # Second call - should hit cache
+        # Second call - should hit cache without adding an entry
         result2 = expander.expand_query(query)
+        stats2 = expander.get_cache_stats()
         
         assert result1 == result2
         
         # Check cache stats
-        stats = expander.get_cache_stats()
-        assert stats["cache_size"] >= 1
-        assert stats["cache_enabled"] == True
+        assert stats1["cache_size"] >= 1
+        assert stats2["cache_size"] == stats1["cache_size"]
+        assert stats2["cache_enabled"] == True
     
-    def test_no_expansion_for_no_keywords(self):
+    def test_no_expansion_for_no_keywords(self, expander):
         """Test query with no expandable keywords"""
-        expander = QueryExpander()
         query = "xyz abc qwerty"  # Nonsense words
         expanded = expander.expand_query(query)
         
@@ -251,6 +259,54 @@ class TestPersonalization:
 # ENHANCED RAG TESTS
 # ==============================================================================
 
+# Tuned HNSW index for the in-memory support collection the retrieval tests
+# query; collections in data/chroma_db are not touched
+HNSW_TEST_PARAMS = {
+    "hnsw:M": 24,
+    "hnsw:construction_ef": 128,
+    "hnsw:search_ef": 100
+}
+
+SUPPORT_TEST_DOCS = (
+    "To return an order, start a return request within 30 days of delivery.",
+    "You can track your order from the Orders page using your tracking number.",
+    "Refunds go back to the original payment method within 5-7 business days.",
+    "If your package has not arrived, contact support with your order number.",
+    "Damaged or defective products can be exchanged free of charge.",
+    "Standard shipping usually takes 3-5 business days."
+)
+
+
+@pytest.fixture(scope="module")
+def support_client():
+    """In-memory ChromaDB client holding an HNSW-tuned support collection"""
+    try:
+        import chromadb
+        from chromadb.config import Settings
+        from backend.vector_store import get_embedding_function
+        
+        client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+        collection = client.get_or_create_collection(
+            name="support",
+            embedding_function=get_embedding_function(),
+            metadata=HNSW_TEST_PARAMS
+        )
+        collection.upsert(
+            ids=[f"support_{i}" for i in range(len(SUPPORT_TEST_DOCS))],
+            documents=list(SUPPORT_TEST_DOCS)
+        )
+    except Exception as e:
+        pytest.skip(f"ChromaDB not available: {e}")
+    return client
+
+
+@pytest.fixture
+def support_collection(support_client, monkeypatch):
+    """Point the retrieval functions under test at the in-memory client"""
+    import backend.vector_store as vector_store
+    monkeypatch.setattr(vector_store, "_chroma_client", support_client)
+
+
 class TestEnhancedRAG:
     """Test enhanced RAG functionality"""
     
@@ -263,6 +319,7 @@ class TestEnhancedRAG:
         except Exception as e:
             pytest.skip(f"ChromaDB not available: {e}")
     
+    @pytest.mark.usefixtures("support_collection")
     def test_retrieve_with_query_expansion_disabled(self):
         """Test retrieval with expansion disabled"""
         try:
@@ -276,6 +333,7 @@ class TestEnhancedRAG:
         except Exception as e:
             pytest.skip(f"Retrieval failed: {e}")
     
+    @pytest.mark.usefixtures("support_collection")
     def test_retrieve_with_query_expansion_enabled(self):
         """Test retrieval with expansion enabled"""
         try:
@@ -323,6 +381,7 @@ class TestEnhancedRAG:
         assert "{customer_name}" not in result
         assert context in result
     
+    @pytest.mark.usefixtures("support_collection")
     def test_hybrid_retrieval_with_expansion(self):
         """Test hybrid retrieval with expansion"""
         try:
@@ -341,6 +400,7 @@ class TestEnhancedRAG:
         except Exception as e:
             pytest.skip(f"Hybrid retrieval failed: {e}")
     
+    @pytest.mark.usefixtures("support_collection")
     def test_hybrid_retrieval_without_reranking(self):
         """Test hybrid retrieval without re-ranking"""
         try:
@@ -532,8 +532,6 @@ def run_all_tests():
     print(f"\n{GREEN}✓ API is ready{RESET}")
     print(f"{CYAN}Starting RAG integration tests...{RESET}\n")
     
-    time.sleep(1)
-    
     results = {
         "Test 1: Content Generation with RAG": test_content_generation_with_rag(),
         "Test 2: Customer Support with RAG": test_customer_support_with_rag(),
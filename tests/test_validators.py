@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Content Validator Test Suite
+
+Pytest version of scripts/test_validators.py. The validator module (and its
+phrase matcher / cached toxicity model) is loaded once per process and shared
+by every parametrized case.
+
+Tests:
+- Length validation (too short / too long)
+- Forbidden phrase detection
+- Professional replies pass all checks
+
+Usage:
+    pytest tests/test_validators.py
+    pytest -n auto tests/test_validators.py   # with pytest-xdist
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+from backend.validators import (
+    validate_length,
+    validate_forbidden_phrases,
+    validate_content,
+    ValidationError
+)
+
+
+_LONG_INPUT = "X" * 6000
+
+FORBIDDEN_CASES = [
+    ("That's not my problem, deal with it yourself", ["not my problem", "deal with it"]),
+    ("You're being stupid about this", ["stupid"]),
+    ("Just shut up and listen", ["shut up"]),
+]
+
+PROFESSIONAL_REPLIES = [
+    "I understand your frustration. Let me help you resolve this issue.",
+    "Thank you for bringing this to our attention. We'll investigate right away.",
+    "I apologize for the inconvenience. Here's what we can do to help.",
+]
+
+
+# ==============================================================================
+# LENGTH VALIDATION TESTS
+# ==============================================================================
+
+class TestLengthValidation:
+    """Test length bounds"""
+
+    @pytest.mark.parametrize("text", ["Hi", _LONG_INPUT])
+    def test_reject_out_of_range(self, text):
+        """Too short and too long content is rejected before other checks"""
+        valid, message = validate_length(text)
+        assert valid == False
+
+        with pytest.raises(ValidationError) as exc_info:
+            validate_content(text)
+        assert exc_info.value.reason == "length_invalid"
+
+    def test_accept_in_range(self):
+        """Content within bounds passes"""
+        valid, message = validate_length("A perfectly reasonable reply.")
+        assert valid == True
+        assert message == ""
+
+
+# ==============================================================================
+# FORBIDDEN PHRASE TESTS
+# ==============================================================================
+
+class TestForbiddenPhrases:
+    """Test forbidden phrase detection"""
+
+    @pytest.mark.parametrize("phrase,expected", FORBIDDEN_CASES)
+    def test_reject(self, phrase, expected):
+        """Forbidden phrases are rejected and reported"""
+        with pytest.raises(ValidationError) as exc_info:
+            validate_content(phrase)
+
+        assert exc_info.value.reason == "forbidden_phrases_detected"
+        found = exc_info.value.details["checks"]["forbidden_phrases"]["found"]
+        assert found == expected
+
+    def test_word_boundaries(self):
+        """Substrings inside other words are not flagged"""
+        valid, message, found = validate_forbidden_phrases("Hello, the class starts soon")
+        assert valid == True
+        assert found == []
+
+
+# ==============================================================================
+# PROFESSIONAL CONTENT TESTS
+# ==============================================================================
+
+class TestProfessionalReplies:
+    """Test that safe support replies are accepted"""
+
+    @pytest.mark.parametrize("reply", PROFESSIONAL_REPLIES)
+    def test_accept(self, reply):
+        """Professional replies pass all checks"""
+        result = validate_content(reply)
+        assert result["valid"] == True
+        assert set(result["checks"]) == {"length", "forbidden_phrases", "toxicity"}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
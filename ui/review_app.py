@@ -4,8 +4,11 @@ Day 8: Human-in-the-Loop Review Interface
 Streamlit app for reviewing and improving AI-generated content
 """
 import os
+import re
 import csv
 import json
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -151,6 +154,36 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+PROFANITY_WORDS = (
+    'damn', 'hell', 'shit', 'fuck', 'bitch',
+    'stupid', 'idiot', 'moron', 'dumb', 'crap'
+)
+SUSPICIOUS_PATTERNS = (
+    'click here', 'free money', 'act now', 'limited time',
+    'guaranteed', '100% free', 'no obligation'
+)
+
+# Combined headline+body length below which pattern scanning is skipped
+MIN_SCANNED_LENGTH = 10
+
+# Both categories fused into one alternation with a named group per pattern.
+# The alternation sits inside a zero-width lookahead, so finditer tries every
+# position and overlapping phrases (e.g., "100% free money") are all
+# reported; word boundaries avoid false positives for profanity (e.g., "hell"
+# in "hello"). No pattern here is a prefix of another, so a position never
+# has two matches competing for the same start.
+_CONTENT_ISSUE_GROUPS = (
+    [('profanity', word, r'\b' + re.escape(word) + r'\b') for word in PROFANITY_WORDS] +
+    [('suspicious', pattern, re.escape(pattern)) for pattern in SUSPICIOUS_PATTERNS]
+)
+_CONTENT_ISSUES_RE = re.compile(
+    '(?=' + '|'.join(
+        f'(?P<p{i}>{regex})' for i, (_, _, regex) in enumerate(_CONTENT_ISSUE_GROUPS)
+    ) + ')',
+    re.IGNORECASE
+)
+
+
 class ValidationRules:
     """Content validation rules for human review"""
     
@@ -182,36 +215,29 @@ class ValidationRules:
         return True, ""
     
     @staticmethod
-    def check_profanity(text: str) -> tuple[bool, str]:
+    def scan_patterns(text: str) -> Dict[str, set]:
+        """Collect profanity and suspicious-pattern matches in a single pass"""
+        matches = {'profanity': set(), 'suspicious': set()}
+        for m in _CONTENT_ISSUES_RE.finditer(text):
+            category, word, _ = _CONTENT_ISSUE_GROUPS[int(m.lastgroup[1:])]
+            matches[category].add(word)
+        return matches
+    
+    @classmethod
+    def check_profanity(cls, text: str, matches: Optional[Dict[str, set]] = None) -> tuple[bool, str]:
         """Basic profanity detection with word boundaries"""
-        import re
-        profanity_list = [
-            'damn', 'hell', 'shit', 'fuck', 'bitch',
-            'stupid', 'idiot', 'moron', 'dumb', 'crap'
-        ]
-        
-        text_lower = text.lower()
-        found = []
-        for word in profanity_list:
-            # Use word boundaries to avoid false positives (e.g., "ass" in "harness", "class")
-            pattern = r'\b' + re.escape(word) + r'\b'
-            if re.search(pattern, text_lower):
-                found.append(word)
+        matched = (matches or cls.scan_patterns(text))['profanity']
+        found = [word for word in PROFANITY_WORDS if word in matched]
         
         if found:
             return False, f"Contains inappropriate language: {', '.join(found)}"
         return True, ""
     
-    @staticmethod
-    def check_unsafe_content(text: str) -> tuple[bool, str]:
+    @classmethod
+    def check_unsafe_content(cls, text: str, matches: Optional[Dict[str, set]] = None) -> tuple[bool, str]:
         """Check for potentially unsafe content patterns"""
-        unsafe_patterns = [
-            'click here', 'free money', 'act now', 'limited time',
-            'guaranteed', '100% free', 'no obligation'
-        ]
-        
-        text_lower = text.lower()
-        found = [pattern for pattern in unsafe_patterns if pattern in text_lower]
+        matched = (matches or cls.scan_patterns(text))['suspicious']
+        found = [pattern for pattern in SUSPICIOUS_PATTERNS if pattern in matched]
         
         if found:
             return False, f"Contains suspicious patterns: {', '.join(found)}"
@@ -228,11 +254,17 @@ class ValidationRules:
         checks = [
             cls.check_empty(headline + body),
             cls.check_too_short(body),
-            cls.check_required_fields(headline, body),
-            cls.check_profanity(headline + " " + body),
-            cls.check_unsafe_content(headline + " " + body)
+            cls.check_required_fields(headline, body)
         ]
         
+        # Empty or trivially short content is already invalid; skip the regex scan
+        if len(headline.strip()) + len(body.strip()) >= MIN_SCANNED_LENGTH:
+            # Profanity and suspicious patterns share one scan of the text
+            text = headline + " " + body
+            matches = cls.scan_patterns(text)
+            checks.append(cls.check_profanity(text, matches))
+            checks.append(cls.check_unsafe_content(text, matches))
+        
         for passed, message in checks:
             if not passed:
                 results['valid'] = False
@@ -282,28 +314,46 @@ def retrieve_context_api(query: str, collection: Optional[str] = None, top_k: in
         return None
 
 
+@st.cache_resource
+def get_feedback_writer():
+    """
+    Long-lived append handle for the feedback CSV (shared across reruns)
+    
+    Every session thread gets the same handle, so writes go through the lock
+    returned with it. The lock lives in the cached resource rather than at
+    module level because Streamlit re-executes this script on every rerun.
+    """
+    fh = open(FEEDBACK_CSV, 'a', newline='', encoding='utf-8', buffering=1 << 16)
+    atexit.register(fh.close)
+    return fh, csv.writer(fh), threading.Lock()
+
+
 def save_feedback(data: Dict):
     """Save human feedback to CSV"""
     try:
-        with open(FEEDBACK_CSV, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                data.get('timestamp'),
-                data.get('session_id'),
-                data.get('content_type'),
-                data.get('topic'),
-                data.get('tone'),
-                data.get('input_prompt'),
-                data.get('retrieved_context'),
-                data.get('generated_headline'),
-                data.get('generated_body'),
-                data.get('decision'),
-                data.get('edited_headline', ''),
-                data.get('edited_body', ''),
-                data.get('reviewer_notes', ''),
-                data.get('validation_issues', ''),
-                data.get('latency_s', 0.0)
-            ])
+        fh, writer, lock = get_feedback_writer()
+        row = [
+            data.get('timestamp'),
+            data.get('session_id'),
+            data.get('content_type'),
+            data.get('topic'),
+            data.get('tone'),
+            data.get('input_prompt'),
+            data.get('retrieved_context'),
+            data.get('generated_headline'),
+            data.get('generated_body'),
+            data.get('decision'),
+            data.get('edited_headline', ''),
+            data.get('edited_body', ''),
+            data.get('reviewer_notes', ''),
+            data.get('validation_issues', ''),
+            data.get('latency_s', 0.0)
+        ]
+        # One whole row per submission, even with concurrent sessions; flush
+        # so stats/table readers see the row without reopening the file
+        with lock:
+            writer.writerow(row)
+            fh.flush()
         logger.info(f"Feedback saved: {data.get('decision')} for {data.get('content_type')}")
         return True
     except Exception as e: